@@ -0,0 +1,22 @@
+-- Indexes backing the Telegram agent's query patterns, for databases created
+-- before they were added to schema.sql. Safe to re-run. Run outside a
+-- transaction block (plain psql) because of CREATE INDEX CONCURRENTLY.
+
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+
+-- Tournament search uses ILIKE '%name%', which a B-tree can't serve
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_predictions_tournament_trgm
+    ON predictions USING gin (tournament gin_trgm_ops);
+
+-- (player1 = X OR player2 = X) AND prediction_day >= ... becomes a BitmapOr
+-- of two range scans. get_performance_trends buckets the matched rows with
+-- date_trunc($unit, ...) afterwards, so no date_trunc expression index is needed
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_predictions_player1_day
+    ON predictions (player1, prediction_day DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_predictions_player2_day
+    ON predictions (player2, prediction_day DESC);
+
+-- Append-mostly, day-ordered data: a BRIN index covers look-back range scans
+-- for a few pages of storage
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_predictions_day_brin
+    ON predictions USING brin (prediction_day);
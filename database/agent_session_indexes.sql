@@ -0,0 +1,13 @@
+-- Optional GIN indexes for ad-hoc introspection of the Telegram agent's
+-- sessions, e.g. WHERE state @> '{"key": "value"}'. The agent itself never
+-- queries state or metadata, and every update_session rewrites both, so these
+-- add write cost on every conversation turn; only create them on databases
+-- where such queries are actually run. Safe to re-run. Run outside a
+-- transaction block (plain psql) because of CREATE INDEX CONCURRENTLY.
+
+-- jsonb_path_ops only supports @> but is smaller and faster than the default
+-- jsonb_ops
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_agent_sessions_state_gin
+    ON agent_sessions USING gin (state jsonb_path_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_agent_sessions_metadata_gin
+    ON agent_sessions USING gin (metadata jsonb_path_ops);
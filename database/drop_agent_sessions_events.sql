@@ -0,0 +1,20 @@
+-- One-off migration for databases created before the Telegram agent kept
+-- event history only in session_events. agent_sessions.events duplicated
+-- those rows and is no longer read or written. Any array entries missing from
+-- session_events are copied over before the column is dropped, in a single
+-- transaction. Only run it on databases that still have the column.
+
+BEGIN;
+
+INSERT INTO session_events (session_id, user_id, app_name, event_type, event_data)
+SELECT s.session_id, s.user_id, s.app_name, COALESCE(e.event->>'type', 'unknown'), e.event
+FROM agent_sessions s
+CROSS JOIN LATERAL jsonb_array_elements(COALESCE(s.events, '[]'::jsonb)) AS e(event)
+WHERE NOT EXISTS (
+    SELECT 1 FROM session_events se
+    WHERE se.session_id = s.session_id AND se.event_data = e.event
+);
+
+ALTER TABLE agent_sessions DROP COLUMN events;
+
+COMMIT;
@@ -0,0 +1,52 @@
+-- Add the player_daily_stats aggregate table to an existing database
+-- and backfill it from the full predictions history.
+-- New installs get the same objects from schema.sql.
+
+CREATE TABLE IF NOT EXISTS player_daily_stats (
+    player VARCHAR(255) NOT NULL,
+    day DATE NOT NULL,
+    surface VARCHAR(50) NOT NULL,
+    tournament VARCHAR(500) NOT NULL,
+    matches INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    value_bets INTEGER NOT NULL,
+    value_bet_wins INTEGER NOT NULL,
+    sum_confidence BIGINT NOT NULL,
+    PRIMARY KEY (player, day, surface, tournament)
+);
+
+-- Rebuild player_daily_stats from p_from onwards. The default window looks a
+-- week back so results recorded after the prediction day are picked up.
+-- The rebuild is a single set-based INSERT ... SELECT running in the
+-- function's one transaction; keep it server-side rather than looping
+-- row-by-row INSERTs from a client.
+-- Run after every scrape upload by run-morning-scrape.sh / run-evening-scrape.sh
+-- (psql -c "SELECT refresh_player_daily_stats();").
+CREATE OR REPLACE FUNCTION refresh_player_daily_stats(p_from DATE DEFAULT CURRENT_DATE - 7)
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM player_daily_stats WHERE day >= p_from;
+
+    INSERT INTO player_daily_stats
+        (player, day, surface, tournament, matches, correct, value_bets, value_bet_wins, sum_confidence)
+    SELECT
+        side.player,
+        pr.prediction_day,
+        pr.surface,
+        pr.tournament,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE pr.predicted_winner = pr.actual_winner),
+        COUNT(*) FILTER (WHERE pr.value_bet),
+        COUNT(*) FILTER (WHERE pr.value_bet AND pr.predicted_winner = pr.actual_winner),
+        SUM(pr.confidence_score)
+    FROM predictions pr
+    CROSS JOIN LATERAL (VALUES (pr.player1), (pr.player2)) AS side(player)
+    WHERE pr.prediction_day >= p_from
+    GROUP BY side.player, pr.prediction_day, pr.surface, pr.tournament;
+END;
+$$ LANGUAGE plpgsql;
+
+-- One-off historical backfill
+SELECT refresh_player_daily_stats('-infinity'::date);
+
+COMMENT ON TABLE player_daily_stats IS 'Per-player, per-day prediction aggregates by surface and tournament';
@@ -0,0 +1,22 @@
+-- Add the mv_player_surface_stats materialized view to an existing database.
+-- New installs get the same objects from schema.sql.
+
+-- Per-player, per-surface prediction confidence, used to rank surface-based
+-- value opportunities. UNIQUE index allows REFRESH ... CONCURRENTLY.
+-- Refreshed after every scrape upload by run-morning-scrape.sh /
+-- run-evening-scrape.sh (REFRESH MATERIALIZED VIEW CONCURRENTLY mv_player_surface_stats).
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_player_surface_stats AS
+SELECT player, surface,
+       AVG(confidence_score) AS avg_confidence,
+       SUM(confidence_score) AS sum_confidence,
+       COUNT(*) AS matches
+FROM (
+    SELECT player1 AS player, surface, confidence_score FROM predictions
+    UNION ALL
+    SELECT player2 AS player, surface, confidence_score FROM predictions
+) sides
+GROUP BY player, surface;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_player_surface_stats ON mv_player_surface_stats(player, surface);
+
+COMMENT ON MATERIALIZED VIEW mv_player_surface_stats IS 'Per-player, per-surface confidence aggregates for ranking value opportunities';
@@ -4,6 +4,7 @@
 -- Enable necessary extensions
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pg_stat_statements";
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 
 -- System metadata table (single row with system-wide information)
 CREATE TABLE system_metadata (
@@ -160,6 +161,22 @@ CREATE TABLE learning_log (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Per-player daily aggregates over predictions, refreshed after each scrape
+-- upload by refresh_player_daily_stats(); the agent's surface/stat queries read this
+-- instead of scanning predictions with (player1 = X OR player2 = X)
+CREATE TABLE player_daily_stats (
+    player VARCHAR(255) NOT NULL,
+    day DATE NOT NULL,
+    surface VARCHAR(50) NOT NULL,
+    tournament VARCHAR(500) NOT NULL,
+    matches INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    value_bets INTEGER NOT NULL,
+    value_bet_wins INTEGER NOT NULL,
+    sum_confidence BIGINT NOT NULL,
+    PRIMARY KEY (player, day, surface, tournament)
+);
+
 -- Player statistics view for easier queries
 CREATE VIEW player_stats AS
 SELECT 
@@ -204,6 +221,24 @@ WHERE prediction_day IS NOT NULL
 GROUP BY DATE(prediction_day)
 ORDER BY prediction_date DESC;
 
+-- Per-player, per-surface prediction confidence, used to rank surface-based
+-- value opportunities. UNIQUE index allows REFRESH ... CONCURRENTLY.
+-- Refreshed after every scrape upload by run-morning-scrape.sh /
+-- run-evening-scrape.sh (REFRESH MATERIALIZED VIEW CONCURRENTLY mv_player_surface_stats).
+CREATE MATERIALIZED VIEW mv_player_surface_stats AS
+SELECT player, surface,
+       AVG(confidence_score) AS avg_confidence,
+       SUM(confidence_score) AS sum_confidence,
+       COUNT(*) AS matches
+FROM (
+    SELECT player1 AS player, surface, confidence_score FROM predictions
+    UNION ALL
+    SELECT player2 AS player, surface, confidence_score FROM predictions
+) sides
+GROUP BY player, surface;
+
+CREATE UNIQUE INDEX idx_mv_player_surface_stats ON mv_player_surface_stats(player, surface);
+
 -- Indexes for performance
 CREATE INDEX idx_players_name ON players(player_name);
 CREATE INDEX idx_players_nationality ON players(nationality);
@@ -213,9 +248,20 @@ CREATE INDEX idx_matches_players ON matches(player1, player2);
 CREATE INDEX idx_matches_winner ON matches(winner);
 CREATE INDEX idx_matches_surface ON matches(surface);
 CREATE INDEX idx_predictions_day ON predictions(prediction_day);
+-- Predictions are appended in day order, so a BRIN index on the day is tiny and
+-- serves the agent's look-back range scans at almost no maintenance cost
+CREATE INDEX idx_predictions_day_brin ON predictions USING brin (prediction_day);
 CREATE INDEX idx_predictions_correct ON predictions(prediction_correct);
 CREATE INDEX idx_predictions_confidence ON predictions(confidence_score);
 CREATE INDEX idx_predictions_winner ON predictions(predicted_winner);
+-- Trigram index so the agent's ILIKE '%name%' tournament search can use an index
+CREATE INDEX idx_predictions_tournament_trgm ON predictions USING gin (tournament gin_trgm_ops);
+-- Per-player history lookups filter (player1 = X OR player2 = X) plus a date
+-- range; one index per side lets the planner BitmapOr two range scans. The
+-- trend query's date_trunc bucketing runs over those few rows, so it needs no
+-- expression index of its own (the unit is a bind parameter anyway)
+CREATE INDEX idx_predictions_player1_day ON predictions(player1, prediction_day DESC);
+CREATE INDEX idx_predictions_player2_day ON predictions(player2, prediction_day DESC);
 CREATE INDEX idx_player_insights_player ON player_insights(player_name);
 CREATE INDEX idx_player_insights_type ON player_insights(insight_type);
 CREATE INDEX idx_learning_log_date ON learning_log(log_date);
@@ -327,6 +373,37 @@ CREATE TRIGGER trigger_update_prediction_accuracy
     WHEN (OLD.actual_winner IS DISTINCT FROM NEW.actual_winner)
     EXECUTE FUNCTION update_prediction_accuracy();
 
+-- Rebuild player_daily_stats from p_from onwards. The default window looks a
+-- week back so results recorded after the prediction day are picked up.
+-- The rebuild is a single set-based INSERT ... SELECT running in the
+-- function's one transaction; keep it server-side rather than looping
+-- row-by-row INSERTs from a client.
+-- Run after every scrape upload by run-morning-scrape.sh / run-evening-scrape.sh
+-- (psql -c "SELECT refresh_player_daily_stats();").
+CREATE OR REPLACE FUNCTION refresh_player_daily_stats(p_from DATE DEFAULT CURRENT_DATE - 7)
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM player_daily_stats WHERE day >= p_from;
+
+    INSERT INTO player_daily_stats
+        (player, day, surface, tournament, matches, correct, value_bets, value_bet_wins, sum_confidence)
+    SELECT
+        side.player,
+        pr.prediction_day,
+        pr.surface,
+        pr.tournament,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE pr.predicted_winner = pr.actual_winner),
+        COUNT(*) FILTER (WHERE pr.value_bet),
+        COUNT(*) FILTER (WHERE pr.value_bet AND pr.predicted_winner = pr.actual_winner),
+        SUM(pr.confidence_score)
+    FROM predictions pr
+    CROSS JOIN LATERAL (VALUES (pr.player1), (pr.player2)) AS side(player)
+    WHERE pr.prediction_day >= p_from
+    GROUP BY side.player, pr.prediction_day, pr.surface, pr.tournament;
+END;
+$$ LANGUAGE plpgsql;
+
 -- Live matches table for real-time dashboard updates (independent from prediction system)
 CREATE TABLE live_matches (
     id SERIAL PRIMARY KEY,
@@ -369,6 +446,8 @@ COMMENT ON TABLE matches IS 'Historical match data with odds and results informa
 COMMENT ON TABLE predictions IS 'AI-generated predictions with confidence scoring and reasoning';
 COMMENT ON TABLE player_insights IS 'Player-specific insights discovered through learning analysis';
 COMMENT ON TABLE learning_log IS 'System learning and pattern discovery tracking';
+COMMENT ON TABLE player_daily_stats IS 'Per-player, per-day prediction aggregates by surface and tournament';
+COMMENT ON MATERIALIZED VIEW mv_player_surface_stats IS 'Per-player, per-surface confidence aggregates for ranking value opportunities';
 COMMENT ON TABLE live_matches IS 'Real-time live match data for dashboard display (independent from prediction system)';
 
 COMMENT ON COLUMN players.giant_killer_score IS 'Score indicating player ability to beat higher-ranked opponents';
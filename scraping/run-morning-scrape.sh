@@ -26,4 +26,27 @@ curl --fail-with-body --silent --show-error \
   --data-binary "@${OUTPUT_FILE}" \
   "${WEBHOOK_URL}"
 
+# Keep the agent's database aggregates in step with the new rows. Results that
+# land after this step are still picked up by the next run: the refresh
+# rebuilds a trailing week.
+if [[ -n "${DATABASE_URL:-}" ]]; then
+  echo "[$(date --iso-8601=seconds)] Refreshing player_daily_stats and mv_player_surface_stats"
+  # Separate -c commands: REFRESH ... CONCURRENTLY cannot run in a transaction block
+  psql "${DATABASE_URL}" -v ON_ERROR_STOP=1 --quiet \
+    -c "SELECT refresh_player_daily_stats();" \
+    -c "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_player_surface_stats;"
+else
+  echo "[$(date --iso-8601=seconds)] WARNING: DATABASE_URL not set; agent aggregates not refreshed" >&2
+fi
+
+if [[ -n "${AGENT_CACHE_BUST_URL:-}" && -n "${CACHE_ADMIN_TOKEN:-}" ]]; then
+  echo "[$(date --iso-8601=seconds)] Invalidating Telegram agent caches"
+  # Best effort: stale replies expire with the cache TTL anyway
+  curl --fail-with-body --silent --show-error \
+    -X POST \
+    -H "X-Admin-Token: ${CACHE_ADMIN_TOKEN}" \
+    "${AGENT_CACHE_BUST_URL}" \
+    || echo "[$(date --iso-8601=seconds)] WARNING: agent cache invalidation failed" >&2
+fi
+
 echo "[$(date --iso-8601=seconds)] Morning scrape run completed successfully"
@@ -0,0 +1,43 @@
+# SIMPLIFIED DIRECT FIX - Replace agents.py with this minimal version
+
+import functools
+
+from google.adk.agents import LlmAgent
+from google.genai import types
+from prompts import (
+    PREDICTION_STATIC_HEADER,
+    PREDICTION_EXAMPLES,
+    static_instruction,
+)
+from tools_registry import TOOLS
+
+GEMINI_MODEL = "gemini-2.5-flash"
+
+# AUTO lets Gemini return several function calls in a single response, which
+# ADK then executes together.
+TOOL_CONFIG = types.GenerateContentConfig(
+    tool_config=types.ToolConfig(
+        function_calling_config=types.FunctionCallingConfig(mode="AUTO"),
+    ),
+)
+
+# The factory is memoized so every caller shares one agent instead of
+# rebuilding LlmAgent objects (and re-processing their instructions) per turn.
+@functools.lru_cache(maxsize=1)
+def create_prediction_agent() -> LlmAgent:
+    """Single agent that handles ALL queries - no complex routing."""
+    return LlmAgent(
+        name="tennis_agent",
+        description="A comprehensive tennis prediction and analysis agent.",
+        # Only the static header is cached; the examples follow it as the
+        # per-request instruction so editing them leaves the prefix intact.
+        static_instruction=static_instruction(PREDICTION_STATIC_HEADER),
+        instruction=PREDICTION_EXAMPLES,
+        model=GEMINI_MODEL,
+        tools=[TOOLS[name] for name in ("get_predictions", "get_value_bets", "analyze_matchup")],
+        generate_content_config=TOOL_CONFIG,
+    )
+
+# tennis_agent handles every query itself, so it is the root agent: one LLM
+# call per turn instead of a dispatcher hop followed by the sub-agent.
+ROOT_AGENT = create_prediction_agent()
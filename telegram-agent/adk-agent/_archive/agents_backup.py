@@ -0,0 +1,123 @@
+import asyncio
+import functools
+import json
+from typing import Optional
+
+from google.adk.agents import LlmAgent
+from google.adk.tools import FunctionTool
+from prompts import (
+    LEGACY_PREDICTION_INSTRUCTION,
+    LEGACY_ANALYSIS_INSTRUCTION,
+    LEGACY_DISPATCHER_INSTRUCTION,
+    static_instruction,
+)
+from tools_registry import TOOLS
+
+# Model constant
+GEMINI_MODEL = "gemini-2.5-flash"
+# Routing is a pure classification step, so the dispatcher uses the lite model
+DISPATCHER_MODEL = "gemini-2.5-flash-lite"
+
+# The factories are memoized so every caller shares one agent tree instead of
+# rebuilding LlmAgent objects (and re-processing their instructions) per turn.
+_dispatcher_agent: Optional[LlmAgent] = None
+
+# Enhanced query functions for database MCP integration
+async def query_database_mcp(tool_name: str, arguments: dict) -> str:
+    """
+    Query the database MCP server for advanced analytics.
+    This function interfaces with the database MCP server to provide
+    sophisticated tennis data analysis capabilities.
+    """
+    try:
+        # Import the database MCP server tools
+        from database_mcp_server import server
+        
+        # Call the MCP tool
+        result = await server.call_tool(tool_name, arguments)
+        
+        if hasattr(result, 'content') and result.content:
+            return result.content[0].text if hasattr(result.content[0], 'text') else str(result.content[0])
+        else:
+            return "No result from database MCP server"
+            
+    except ImportError:
+        return "Database MCP server not available. Please ensure database_mcp_server.py is running."
+    except Exception as e:
+        return f"Error querying database MCP: {str(e)}"
+
+async def query_database(
+    query_type: str,
+    **kwargs
+) -> str:
+    """
+    Query the tennis database for various types of analysis.
+
+    Args:
+        query_type: Type of query (player_stats, tournament_analysis, head_to_head, 
+                   form_analysis, surface_analysis, odds_analysis, value_opportunities, 
+                   performance_trends)
+        **kwargs: Query-specific parameters
+    """
+
+    # Map query types to MCP tool names
+    query_mapping = {
+        "player_stats": "get_player_stats",
+        "tournament_analysis": "get_tournament_analysis", 
+        "head_to_head": "get_head_to_head",
+        "form_analysis": "get_form_analysis",
+        "surface_analysis": "get_surface_analysis",
+        "odds_analysis": "get_odds_analysis",
+        "value_opportunities": "get_value_opportunities",
+        "performance_trends": "get_performance_trends"
+    }
+
+    mcp_tool_name = query_mapping.get(query_type)
+    if not mcp_tool_name:
+        available_types = ", ".join(query_mapping.keys())
+        return f"Invalid query type: {query_type}. Available types: {available_types}"
+
+    try:
+        return await query_database_mcp(mcp_tool_name, kwargs)
+    except Exception as e:
+        return f"Error executing {query_type} query: {str(e)}"
+
+# Built once at import; every prediction agent shares the same tool instance
+DATABASE_QUERY_TOOL = FunctionTool(query_database)
+
+@functools.lru_cache(maxsize=1)
+def create_prediction_agent() -> LlmAgent:
+    """Creates an agent specialized in fetching tennis predictions."""
+    return LlmAgent(
+        name="prediction_agent",
+        description="Fetches tennis match predictions from the database and performs advanced analytics.",
+        static_instruction=static_instruction(LEGACY_PREDICTION_INSTRUCTION),
+        model=GEMINI_MODEL,
+        tools=[TOOLS[name] for name in ("get_predictions", "get_value_bets", "get_player_matchups", "analyze_player_performance")] + [DATABASE_QUERY_TOOL],
+    )
+
+@functools.lru_cache(maxsize=1)
+def create_analysis_agent() -> LlmAgent:
+    """Creates an agent specialized in analyzing matchups."""
+    return LlmAgent(
+        name="analysis_agent",
+        description="Analyzes tennis matchups using external AI models.",
+        static_instruction=static_instruction(LEGACY_ANALYSIS_INSTRUCTION),
+        model=GEMINI_MODEL,
+        tools=[TOOLS["analyze_matchup"]],
+    )
+
+def create_dispatcher_agent(prediction_agent: LlmAgent, analysis_agent: LlmAgent) -> LlmAgent:
+    """Creates a dispatcher agent that routes requests to sub-agents."""
+    # ADK agents can only have one parent, so the dispatcher over the cached
+    # sub-agents is built once and reused.
+    global _dispatcher_agent
+    if _dispatcher_agent is None:
+        _dispatcher_agent = LlmAgent(
+            name="tennis_dispatcher",
+            description="The main dispatcher agent that routes user requests to the appropriate sub-agent.",
+            static_instruction=static_instruction(LEGACY_DISPATCHER_INSTRUCTION),
+            model=DISPATCHER_MODEL,
+            sub_agents=[prediction_agent, analysis_agent],
+        )
+    return _dispatcher_agent
@@ -0,0 +1,58 @@
+# QUICK FIX: Enhanced Dispatcher Agent with explicit routing
+
+import functools
+from typing import Optional
+
+from google.adk.agents import LlmAgent
+from prompts import (
+    ROUTED_PREDICTION_INSTRUCTION,
+    ROUTED_ANALYSIS_INSTRUCTION,
+    ROUTED_DISPATCHER_INSTRUCTION,
+    static_instruction,
+)
+from tools_registry import TOOLS
+
+GEMINI_MODEL = "gemini-2.5-flash"
+# Routing is a pure classification step, so the dispatcher uses the lite model
+DISPATCHER_MODEL = "gemini-2.5-flash-lite"
+
+# The factories are memoized so every caller shares one agent tree instead of
+# rebuilding LlmAgent objects (and re-processing their instructions) per turn.
+_dispatcher_agent: Optional[LlmAgent] = None
+
+def create_dispatcher_agent(prediction_agent: LlmAgent, analysis_agent: LlmAgent) -> LlmAgent:
+    """Creates a dispatcher agent with EXPLICIT routing rules."""
+    # ADK agents can only have one parent, so the dispatcher over the cached
+    # sub-agents is built once and reused.
+    global _dispatcher_agent
+    if _dispatcher_agent is None:
+        _dispatcher_agent = LlmAgent(
+            name="tennis_dispatcher",
+            description="The main dispatcher agent that routes user requests to the appropriate sub-agent.",
+            static_instruction=static_instruction(ROUTED_DISPATCHER_INSTRUCTION),
+            model=DISPATCHER_MODEL,
+            sub_agents=[prediction_agent, analysis_agent],
+        )
+    return _dispatcher_agent
+
+@functools.lru_cache(maxsize=1)
+def create_prediction_agent() -> LlmAgent:
+    """Creates an agent specialized in fetching tennis predictions."""
+    return LlmAgent(
+        name="prediction_agent",
+        description="Fetches tennis predictions and analyzes single players.",
+        static_instruction=static_instruction(ROUTED_PREDICTION_INSTRUCTION),
+        model=GEMINI_MODEL,
+        tools=[TOOLS[name] for name in ("get_predictions", "get_value_bets")],
+    )
+
+@functools.lru_cache(maxsize=1)
+def create_analysis_agent() -> LlmAgent:
+    """Creates an agent specialized in analyzing matchups."""
+    return LlmAgent(
+        name="analysis_agent", 
+        description="Analyzes tennis matchups using external AI models.",
+        static_instruction=static_instruction(ROUTED_ANALYSIS_INSTRUCTION),
+        model=GEMINI_MODEL,
+        tools=[TOOLS["analyze_matchup"]],
+    )
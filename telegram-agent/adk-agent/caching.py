@@ -0,0 +1,71 @@
+"""
+In-process TTL response cache for agent tools.
+
+Identical tool calls (same function, same arguments) coming from different
+Telegram users within the TTL are served from memory instead of repeating the
+database or LLM round trip.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def make_cache_key(name: str, arguments: Dict[str, Any]) -> str:
+    """Hash a call as sha256 over the tool name and its sorted JSON arguments."""
+    payload = json.dumps({"tool": name, "args": arguments}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def ttl_cache(ttl: int = 300, cache_if: Optional[Callable[[Any], bool]] = None):
+    """
+    Cache a function's results for `ttl` seconds, keyed by its bound arguments.
+
+    Args:
+        ttl: Seconds a cached result stays valid.
+        cache_if: Optional predicate; results for which it returns False
+            (e.g. error messages) are returned but not stored.
+
+    The wrapped function gains a `cache_clear()` method for manual busting.
+    The cache is guarded by a lock because tools run on a thread pool.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        entries: Dict[str, Tuple[float, Any]] = {}
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Bind with defaults so f(x) and f(x, limit=20) share one entry
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = make_cache_key(func.__name__, bound.arguments)
+
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(key)
+                if entry and entry[0] > now:
+                    return entry[1]
+
+            result = func(*args, **kwargs)
+
+            if cache_if is None or cache_if(result):
+                with lock:
+                    entries[key] = (now + ttl, result)
+                    # Drop expired entries so the dict doesn't grow unbounded
+                    for stale in [k for k, (expires, _) in entries.items() if expires <= now]:
+                        del entries[stale]
+            return result
+
+        def cache_clear() -> None:
+            with lock:
+                entries.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
@@ -6,7 +6,47 @@ This helps verify if the fix has taken effect.
 """
 
 import os
+import re
 import sys
+from typing import Dict, Tuple
+
+# Compiled once rather than on every check
+_NAME_RE = re.compile(r'name="([^"]+)"')
+
+# Version markers, matched together in a single scan of the sources
+_MARKERS = {
+    'simple_factory': 'create_prediction_agent() -> LlmAgent:',
+    'tennis_agent': 'name="tennis_agent"',
+    'comprehensive': 'You handle ALL tennis-related queries',
+    'cirpanli_example': 'recent predictions involving cirpanli" → use get_predictions',
+    'dispatcher_factory': 'create_dispatcher_agent',
+    'tennis_dispatcher': 'tennis_dispatcher',
+}
+_MARKER_RE = re.compile('|'.join(re.escape(marker) for marker in _MARKERS.values()))
+_MARKER_KEYS = {marker: key for key, marker in _MARKERS.items()}
+
+def find_markers(content: str) -> set:
+    """Return the keys of every version marker present in content."""
+    return {_MARKER_KEYS[match] for match in _MARKER_RE.findall(content)}
+
+# Instruction text lives in prompts.py, agent wiring in agents.py
+AGENT_SOURCES = ('agents.py', 'prompts.py')
+
+_source_cache: Dict[Tuple[str, ...], Tuple[Tuple[int, ...], str]] = {}
+
+def read_agent_sources(paths: Tuple[str, ...] = AGENT_SOURCES) -> str:
+    """Return the concatenated sources, re-reading only when a file's mtime changes."""
+    mtimes = tuple(os.stat(path).st_mtime_ns for path in paths)
+    cached = _source_cache.get(paths)
+    if cached and cached[0] == mtimes:
+        return cached[1]
+    
+    content = ''
+    for path in paths:
+        with open(path, 'r') as f:
+            content += f.read()
+    _source_cache[paths] = (mtimes, content)
+    return content
 
 def check_bot_version():
     """Check which version of agents.py is being used."""
@@ -16,19 +56,19 @@ def check_bot_version():
     # Change to script directory
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
     
-    with open('agents.py', 'r') as f:
-        content = f.read()
+    content = read_agent_sources()
+    found = find_markers(content)
     
     # Check for new simplified version
-    if 'create_prediction_agent() -> LlmAgent:' in content and 'name="tennis_agent"' in content:
+    if {'simple_factory', 'tennis_agent'} <= found:
         print("✅ Using NEW simplified version")
         print("🎯 Should work correctly now")
         
         # Show key parts
-        if 'You handle ALL tennis-related queries' in content:
+        if 'comprehensive' in found:
             print("✅ Comprehensive agent instructions found")
         
-        if 'recent predictions involving cirpanli" → use get_predictions' in content:
+        if 'cirpanli_example' in found:
             print("✅ Cirpanli routing example found")
             
         print("\n💡 If still getting wrong response:")
@@ -36,19 +76,18 @@ def check_bot_version():
         print("   2. Clear any Python caches")
         print("   3. Check if running from different directory")
         
-    elif 'create_dispatcher_agent' in content and 'tennis_dispatcher' in content:
+    elif {'dispatcher_factory', 'tennis_dispatcher'} <= found:
         print("❌ Using OLD complex routing version")
         print("🔄 This version has routing issues")
         print("\n💡 SOLUTION:")
-        print("   Replace agents.py with agents_SIMPLE_FIX.py")
+        print("   Replace agents.py with _archive/agents_SIMPLE_FIX.py")
         
     else:
         print("❓ Unknown version")
         print("📋 Current agent structure found")
         
     # Show agent names
-    import re
-    agents = re.findall(r'name="([^"]+)"', content)
+    agents = _NAME_RE.findall(content)
     if agents:
         print(f"\n📊 Agent names found: {agents}")
     
@@ -0,0 +1,11 @@
+"""
+Timestamped console messages for the startup and test scripts.
+"""
+
+from datetime import datetime
+
+
+def log(message: str) -> None:
+    """Print message stamped with the time; leading newlines stay ahead of the stamp."""
+    text = message.lstrip("\n")
+    print(f"{message[:len(message) - len(text)]}[{datetime.now():%H:%M:%S}] {text}")
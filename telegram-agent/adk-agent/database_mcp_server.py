@@ -16,19 +16,264 @@ Features:
 """
 
 import asyncio
-import json
 import os
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-import psycopg2
+import asyncpg
+import orjson
 from dotenv import load_dotenv
 from mcp.server import Server
 from mcp.types import CallToolResult, ListToolsResult, Tool
 
+from caching import make_cache_key
+
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "4"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+# Rows fetched per round trip when streaming through a server-side cursor
+CURSOR_PREFETCH = int(os.getenv("CURSOR_PREFETCH", "500"))
+
+# Tool results are cached for a few minutes; tournament history barely moves,
+# so it keeps for an hour.
+MCP_CACHE_TTL = int(os.getenv("MCP_CACHE_TTL", "300"))
+MCP_CACHE_MAX_ENTRIES = int(os.getenv("MCP_CACHE_MAX_ENTRIES", "1024"))
+TOOL_CACHE_TTLS = {
+    "get_tournament_analysis": int(os.getenv("MCP_HISTORICAL_CACHE_TTL", "3600")),
+}
+
+# key -> (expires_at, result)
+_result_cache: Dict[str, Tuple[float, CallToolResult]] = {}
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_pool() -> asyncpg.Pool:
+    """Return the shared asyncpg pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await asyncpg.create_pool(
+                    DATABASE_URL,
+                    min_size=DB_POOL_MIN_SIZE,
+                    max_size=DB_POOL_MAX_SIZE,
+                    statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+                )
+    return _pool
+
+def clear_result_cache() -> None:
+    """Bust cached tool results, e.g. after new predictions or results are loaded."""
+    _result_cache.clear()
+
+# Hot queries are module-level constants so every call sends byte-identical
+# text: asyncpg prepares statements per connection and caches them by query
+# text, so repeat calls reuse the server-side plan instead of re-parsing.
+
+# get_player_stats: overall stats, recent form, tournament breakdown
+PLAYER_STATS_SQL = """
+SELECT
+    COUNT(*) as total_predictions,
+    AVG(confidence_score) as avg_confidence,
+    COUNT(CASE WHEN predicted_winner = actual_winner THEN 1 END) as correct_predictions,
+    COUNT(CASE WHEN recommended_action = 'bet' AND actual_winner IS NOT NULL THEN 1 END) as bet_outcomes,
+    COUNT(CASE WHEN recommended_action = 'bet' AND predicted_winner = actual_winner THEN 1 END) as successful_bets,
+    AVG(CASE WHEN value_bet THEN odds_player1 ELSE odds_player2 END) as avg_odds
+FROM predictions
+WHERE (player1 = $1 OR player2 = $1)
+AND prediction_day >= CURRENT_DATE - make_interval(days => $2::int)
+"""
+
+PLAYER_FORM_SQL = """
+SELECT prediction_day, player1, player2, predicted_winner, actual_winner,
+       confidence_score, recommended_action, tournament, surface, value_bet
+FROM predictions
+WHERE (player1 = $1 OR player2 = $1)
+AND prediction_day >= CURRENT_DATE - make_interval(days => $2::int)
+ORDER BY prediction_day DESC
+LIMIT 20
+"""
+
+PLAYER_TOURNAMENTS_SQL = """
+SELECT tournament, COUNT(*) as total_matches,
+       AVG(confidence_score) as avg_confidence
+FROM predictions
+WHERE (player1 = $1 OR player2 = $1)
+AND prediction_day >= CURRENT_DATE - make_interval(days => $2::int)
+GROUP BY tournament
+ORDER BY total_matches DESC
+"""
+
+# Postgres builds the whole response document, so the handler forwards one
+# text value instead of building and serializing a dict per row. NULL when
+# the players never met in the window.
+HEAD_TO_HEAD_SQL = """
+SELECT CASE WHEN COUNT(*) > 0 THEN json_build_object(
+    'players', json_build_array($1::text, $2::text),
+    'time_period', $3::int || ' years',
+    'total_matches', COUNT(*),
+    'wins', json_build_object(
+        $1::text, COUNT(*) FILTER (WHERE actual_winner = $1),
+        $2::text, COUNT(*) FILTER (WHERE actual_winner = $2)
+    ),
+    'prediction_accuracies', json_build_object(
+        $1::text, to_char(COALESCE(100.0 * COUNT(*) FILTER (WHERE predicted_winner = $1 AND actual_winner = $1)
+                          / NULLIF(COUNT(*) FILTER (WHERE predicted_winner = $1), 0), 0), 'FM990.0') || '%',
+        $2::text, to_char(COALESCE(100.0 * COUNT(*) FILTER (WHERE predicted_winner = $2 AND actual_winner = $2)
+                          / NULLIF(COUNT(*) FILTER (WHERE predicted_winner = $2), 0), 0), 'FM990.0') || '%'
+    ),
+    'match_history', json_agg(json_build_object(
+        'date', COALESCE(to_char(prediction_day, 'YYYY-MM-DD'), 'N/A'),
+        'predicted_winner', predicted_winner,
+        'actual_winner', actual_winner,
+        'confidence', confidence_score,
+        'odds', to_char(odds_player1, 'FM999990.00') || ' vs ' || to_char(odds_player2, 'FM999990.00'),
+        'tournament', tournament,
+        'surface', surface,
+        'recommended_action', recommended_action
+    ) ORDER BY prediction_day DESC)
+) END
+FROM predictions
+WHERE ((player1 = $1 AND player2 = $2) OR (player1 = $2 AND player2 = $1))
+AND prediction_day >= CURRENT_DATE - make_interval(years => $3::int)
+"""
+
+# Top-N recent matches for every requested player in one statement: the
+# LATERAL subquery runs the per-player LIMIT, and the per-player counts are
+# window aggregates over exactly those rows
+FORM_ANALYSIS_SQL = """
+SELECT recent.*,
+       COUNT(*) FILTER (WHERE actual_winner = pl.name) OVER w AS wins,
+       COUNT(*) FILTER (WHERE predicted_winner = pl.name) OVER w AS predicted_wins,
+       COUNT(*) FILTER (WHERE predicted_winner = pl.name AND actual_winner = pl.name) OVER w AS correct_predictions,
+       COUNT(*) FILTER (WHERE value_bet) OVER w AS value_bets,
+       COUNT(*) FILTER (WHERE value_bet AND actual_winner = pl.name) OVER w AS value_bet_wins,
+       pl.name AS player_name
+FROM unnest($1::text[]) AS pl(name)
+JOIN LATERAL (
+    SELECT prediction_day, player1, player2, predicted_winner, actual_winner,
+           confidence_score, recommended_action, value_bet, odds_player1, odds_player2
+    FROM predictions
+    WHERE (player1 = pl.name OR player2 = pl.name)
+    AND prediction_day >= CURRENT_DATE - make_interval(days => $2::int)
+    ORDER BY prediction_day DESC
+    LIMIT $3
+) recent ON TRUE
+WINDOW w AS (PARTITION BY pl.name)
+ORDER BY pl.name, prediction_day DESC
+"""
+
+# Optional filters are bound as NULL-able parameters rather than spliced in,
+# so the text stays constant whichever filters a call uses. The year filter
+# is a date range so it can use the prediction_day indexes.
+TOURNAMENT_ANALYSIS_SQL = """
+SELECT surface, COUNT(*) as total_predictions,
+       AVG(confidence_score) as avg_confidence,
+       COUNT(CASE WHEN value_bet THEN 1 END) as value_bets,
+       COUNT(CASE WHEN predicted_winner = actual_winner THEN 1 END) as correct_predictions
+FROM predictions
+WHERE tournament ILIKE $1
+AND ($2::int IS NULL OR (prediction_day >= make_date($2, 1, 1)
+                         AND prediction_day < make_date($2 + 1, 1, 1)))
+GROUP BY surface
+ORDER BY total_predictions DESC
+"""
+
+ODDS_ANALYSIS_SQL = """
+SELECT player1, player2, tournament, surface,
+       predicted_winner, odds_player1, odds_player2,
+       confidence_score, recommended_action, value_bet,
+       prediction_day, actual_winner
+FROM predictions
+WHERE confidence_score >= $1
+AND (odds_player1 >= $2 OR odds_player2 >= $2)
+AND ($3::date IS NULL OR prediction_day >= $3)
+AND ($4::date IS NULL OR prediction_day <= $4)
+ORDER BY confidence_score DESC, prediction_day DESC
+LIMIT 50
+"""
+
+TREND_TRUNC_UNITS = {"daily": "day", "weekly": "week", "monthly": "month"}
+
+# The only text ever interpolated into the trend query. Everything user-supplied
+# (player, window, bucket unit) is a bind parameter.
+TREND_METRIC_SQL = {
+    "confidence_score": "AVG(confidence_score)",
+    "win_rate": "COUNT(CASE WHEN predicted_winner = actual_winner THEN 1 END) * 100.0 / COUNT(*)",
+    "odds_accuracy": "COUNT(CASE WHEN predicted_winner = actual_winner THEN 1 END) * 100.0 / COUNT(*)",
+}
+
+# get_performance_trends: bucketing, the three-bucket moving averages at each
+# end and the overall change are all computed server-side; every row carries
+# the trend columns. Built once per metric at import, so each call sends one
+# of a few fixed strings that asyncpg's statement cache can reuse.
+TREND_SQL_TEMPLATE = """
+WITH bucketed AS (
+    SELECT date_trunc($3, prediction_day)::date as period, {metric_sql} as metric_value
+    FROM predictions
+    WHERE (player1 = $1 OR player2 = $1)
+    AND prediction_day >= CURRENT_DATE - make_interval(days => $2::int)
+    GROUP BY period
+),
+windowed AS (
+    SELECT period, metric_value,
+           AVG(metric_value) OVER (ORDER BY period ROWS BETWEEN 2 PRECEDING AND CURRENT ROW) AS recent_avg,
+           AVG(metric_value) OVER (ORDER BY period ROWS BETWEEN CURRENT ROW AND 2 FOLLOWING) AS earlier_avg
+    FROM bucketed
+),
+ends AS (
+    SELECT period, metric_value,
+           LAST_VALUE(recent_avg) OVER whole AS recent_avg,
+           FIRST_VALUE(earlier_avg) OVER whole AS earlier_avg,
+           COUNT(*) OVER whole AS buckets
+    FROM windowed
+    WINDOW whole AS (ORDER BY period ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+)
+SELECT period, metric_value, buckets, recent_avg, earlier_avg,
+       COALESCE((recent_avg - earlier_avg) / NULLIF(earlier_avg, 0) * 100, 0) AS trend_change
+FROM ends
+ORDER BY period
+"""
+
+TREND_SQL = {
+    metric: TREND_SQL_TEMPLATE.format(metric_sql=metric_sql)
+    for metric, metric_sql in TREND_METRIC_SQL.items()
+}
+
+def _json_default(value: Any) -> Any:
+    # NUMERIC columns come back as Decimal, which orjson doesn't handle natively
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def to_json(result: Dict[str, Any]) -> str:
+    """Serialize a handler result with orjson; dates render as YYYY-MM-DD."""
+    return orjson.dumps(result, option=orjson.OPT_INDENT_2, default=_json_default).decode()
+
+async def fetch_formatted_rows(
+    query: str,
+    params: Tuple[Any, ...],
+    format_row: Callable[[asyncpg.Record], Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Run a query through a server-side cursor, formatting rows as they arrive.
+
+    Only the formatted dicts are kept, so a large result set never sits in
+    memory as Records as well.
+    """
+    pool = await get_pool()
+    rows: List[Dict[str, Any]] = []
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            async for row in conn.cursor(query, *params, prefetch=CURSOR_PREFETCH):
+                rows.append(format_row(row))
+    return rows
 
 # Initialize MCP Server
 server = Server("tennis-database-mcp")
@@ -148,31 +393,41 @@ async def list_tools() -> ListToolsResult:
 
 @server.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
+    """Execute a tool, serving identical recent calls from the result cache."""
+    # Every tool is a read over data that changes at most daily. The cache is
+    # only touched between awaits, so the event loop already serializes access.
+    # Omitted dates and day windows resolve against today, so the date is part
+    # of the key and entries cached before midnight don't answer after it.
+    key = make_cache_key(name, {"arguments": arguments, "as_of": date.today().isoformat()})
+    now = time.monotonic()
+    entry = _result_cache.get(key)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    result = await execute_tool(name, arguments)
+
+    if not result.isError:
+        _result_cache[key] = (now + TOOL_CACHE_TTLS.get(name, MCP_CACHE_TTL), result)
+        if len(_result_cache) > MCP_CACHE_MAX_ENTRIES:
+            for stale in [k for k, (expires, _) in _result_cache.items() if expires <= now]:
+                del _result_cache[stale]
+            # Still full: evict the oldest insertion
+            if len(_result_cache) > MCP_CACHE_MAX_ENTRIES:
+                del _result_cache[next(iter(_result_cache))]
+    return result
+
+async def execute_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
     """Execute database queries based on tool name and arguments."""
     
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        return CallToolResult(
+            content=[{"type": "text", "text": f"Unknown tool: {name}"}],
+            isError=True
+        )
+
     try:
-        if name == "get_player_stats":
-            return await get_player_stats(**arguments)
-        elif name == "get_tournament_analysis":
-            return await get_tournament_analysis(**arguments)
-        elif name == "get_head_to_head":
-            return await get_head_to_head(**arguments)
-        elif name == "get_form_analysis":
-            return await get_form_analysis(**arguments)
-        elif name == "get_surface_analysis":
-            return await get_surface_analysis(**arguments)
-        elif name == "get_odds_analysis":
-            return await get_odds_analysis(**arguments)
-        elif name == "get_value_opportunities":
-            return await get_value_opportunities(**arguments)
-        elif name == "get_performance_trends":
-            return await get_performance_trends(**arguments)
-        else:
-            return CallToolResult(
-                content=[{"type": "text", "text": f"Unknown tool: {name}"}],
-                isError=True
-            )
-    
+        return await handler(**arguments)
     except Exception as e:
         return CallToolResult(
             content=[{"type": "text", "text": f"Error executing {name}: {str(e)}"}],
@@ -185,100 +440,64 @@ async def get_player_stats(
     include_tournaments: bool = True
 ) -> CallToolResult:
     """Get comprehensive player statistics."""
-    conn = psycopg2.connect(DATABASE_URL)
-    try:
-        with conn.cursor() as cur:
-            # Basic stats query
-            stats_query = """
-                SELECT 
-                    COUNT(*) as total_predictions,
-                    AVG(confidence_score) as avg_confidence,
-                    COUNT(CASE WHEN predicted_winner = actual_winner THEN 1 END) as correct_predictions,
-                    COUNT(CASE WHEN recommended_action = 'bet' AND actual_winner IS NOT NULL THEN 1 END) as bet_outcomes,
-                    COUNT(CASE WHEN recommended_action = 'bet' AND predicted_winner = actual_winner THEN 1 END) as successful_bets,
-                    AVG(CASE WHEN value_bet THEN odds_player1 ELSE odds_player2 END) as avg_odds
-                FROM predictions 
-                WHERE (player1 = %s OR player2 = %s)
-                AND prediction_day >= CURRENT_DATE - INTERVAL '%s days'
-            """
-            cur.execute(stats_query, (player_name, player_name, days_back))
-            stats = cur.fetchone()
-            
-            # Recent form query
-            form_query = """
-                SELECT prediction_day, predicted_winner, actual_winner, confidence_score, 
-                       recommended_action, tournament, surface, value_bet
-                FROM predictions 
-                WHERE (player1 = %s OR player2 = %s)
-                AND prediction_day >= CURRENT_DATE - INTERVAL '%s days'
-                ORDER BY prediction_day DESC
-                LIMIT 20
-            """
-            cur.execute(form_query, (player_name, player_name, days_back))
-            recent_matches = cur.fetchall()
-            
-            # Tournament breakdown if requested
-            tournament_breakdown = []
-            if include_tournaments:
-                tour_query = """
-                    SELECT tournament, COUNT(*) as total_matches, 
-                           AVG(confidence_score) as avg_confidence
-                    FROM predictions 
-                    WHERE (player1 = %s OR player2 = %s)
-                    AND prediction_day >= CURRENT_DATE - INTERVAL '%s days'
-                    GROUP BY tournament
-                    ORDER BY total_matches DESC
-                """
-                cur.execute(tour_query, (player_name, player_name, days_back))
-                tournament_breakdown = cur.fetchall()
-            
-            # Format results
-            total_predictions, avg_confidence, correct_predictions, bet_outcomes, successful_bets, avg_odds = stats
-            accuracy_rate = (correct_predictions / total_predictions * 100) if total_predictions > 0 else 0
-            bet_success_rate = (successful_bets / bet_outcomes * 100) if bet_outcomes > 0 else 0
-            
-            result = {
-                "player": player_name,
-                "period_days": days_back,
-                "overall_stats": {
-                    "total_predictions": total_predictions,
-                    "accuracy_rate": f"{accuracy_rate:.1f}%",
-                    "average_confidence": f"{avg_confidence:.1f}" if avg_confidence else "N/A",
-                    "bet_outcomes": bet_outcomes,
-                    "bet_success_rate": f"{bet_success_rate:.1f}%" if bet_outcomes > 0 else "N/A",
-                    "average_odds": f"{avg_odds:.2f}" if avg_odds else "N/A"
-                },
-                "recent_form": [
-                    {
-                        "date": match[0].strftime("%Y-%m-%d") if match[0] else "N/A",
-                        "opponent": match[1] if match[1] != player_name else match[2],
-                        "predicted_winner": match[1],
-                        "actual_winner": match[3],
-                        "confidence": match[4],
-                        "action": match[5],
-                        "tournament": match[6],
-                        "surface": match[7],
-                        "value_bet": "Yes" if match[8] else "No"
-                    }
-                    for match in recent_matches
-                ],
-                "tournament_breakdown": [
-                    {
-                        "tournament": tour[0],
-                        "matches": tour[1],
-                        "avg_confidence": f"{tour[2]:.1f}" if tour[2] else "N/A"
-                    }
-                    for tour in tournament_breakdown
-                ] if include_tournaments else []
+    days_back = int(days_back)
+    pool = await get_pool()
+
+    # The three queries are independent, so each runs on its own pooled
+    # connection and the handler waits for the slowest rather than the sum.
+    queries = [
+        pool.fetchrow(PLAYER_STATS_SQL, player_name, days_back),
+        pool.fetch(PLAYER_FORM_SQL, player_name, days_back),
+    ]
+    if include_tournaments:
+        queries.append(pool.fetch(PLAYER_TOURNAMENTS_SQL, player_name, days_back))
+    stats, recent_matches, *rest = await asyncio.gather(*queries)
+    tournament_breakdown = rest[0] if rest else []
+
+    # Format results
+    total_predictions, avg_confidence, correct_predictions, bet_outcomes, successful_bets, avg_odds = stats
+    accuracy_rate = (correct_predictions / total_predictions * 100) if total_predictions > 0 else 0
+    bet_success_rate = (successful_bets / bet_outcomes * 100) if bet_outcomes > 0 else 0
+
+    result = {
+        "player": player_name,
+        "period_days": days_back,
+        "overall_stats": {
+            "total_predictions": total_predictions,
+            "accuracy_rate": f"{accuracy_rate:.1f}%",
+            "average_confidence": f"{avg_confidence:.1f}" if avg_confidence else "N/A",
+            "bet_outcomes": bet_outcomes,
+            "bet_success_rate": f"{bet_success_rate:.1f}%" if bet_outcomes > 0 else "N/A",
+            "average_odds": f"{avg_odds:.2f}" if avg_odds else "N/A"
+        },
+        "recent_form": [
+            {
+                "date": match[0] or "N/A",
+                "opponent": match[2] if match[1] == player_name else match[1],
+                "predicted_winner": match[3],
+                "actual_winner": match[4],
+                "confidence": match[5],
+                "action": match[6],
+                "tournament": match[7],
+                "surface": match[8],
+                "value_bet": "Yes" if match[9] else "No"
             }
-            
-            return CallToolResult(
-                content=[{"type": "text", "text": json.dumps(result, indent=2)}],
-                isError=False
-            )
-    
-    finally:
-        conn.close()
+            for match in recent_matches
+        ],
+        "tournament_breakdown": [
+            {
+                "tournament": tour[0],
+                "matches": tour[1],
+                "avg_confidence": f"{tour[2]:.1f}" if tour[2] else "N/A"
+            }
+            for tour in tournament_breakdown
+        ] if include_tournaments else []
+    }
+
+    return CallToolResult(
+        content=[{"type": "text", "text": to_json(result)}],
+        isError=False
+    )
 
 async def get_head_to_head(
     player1: str,
@@ -286,73 +505,20 @@ async def get_head_to_head(
     years_back: int = 2
 ) -> CallToolResult:
     """Get head-to-head statistics between two players."""
-    conn = psycopg2.connect(DATABASE_URL)
-    try:
-        with conn.cursor() as cur:
-            query = """
-                SELECT prediction_day, predicted_winner, actual_winner, 
-                       confidence_score, odds_player1, odds_player2,
-                       tournament, surface, recommended_action
-                FROM predictions 
-                WHERE (player1 = %s AND player2 = %s) OR (player1 = %s AND player2 = %s)
-                AND prediction_day >= CURRENT_DATE - INTERVAL '%s years'
-                ORDER BY prediction_day DESC
-            """
-            cur.execute(query, (player1, player2, player2, player1, years_back))
-            matches = cur.fetchall()
-            
-            if not matches:
-                return CallToolResult(
-                    content=[{"type": "text", "text": f"No head-to-head matches found between {player1} and {player2} in the last {years_back} years."}],
-                    isError=False
-                )
-            
-            # Calculate statistics
-            p1_wins = sum(1 for match in matches if match[2] == player1)
-            p2_wins = sum(1 for match in matches if match[2] == player2)
-            total_matches = len(matches)
-            
-            # Calculate predictions accuracy for each player
-            p1_predicted = sum(1 for match in matches if match[1] == player1)
-            p2_predicted = sum(1 for match in matches if match[1] == player2)
-            
-            p1_prediction_accuracy = sum(1 for match in matches if match[1] == player1 and match[2] == player1) / p1_predicted * 100 if p1_predicted > 0 else 0
-            p2_prediction_accuracy = sum(1 for match in matches if match[1] == player2 and match[2] == player2) / p2_predicted * 100 if p2_predicted > 0 else 0
-            
-            result = {
-                "players": [player1, player2],
-                "time_period": f"{years_back} years",
-                "total_matches": total_matches,
-                "wins": {
-                    player1: p1_wins,
-                    player2: p2_wins
-                },
-                "prediction_accuracies": {
-                    player1: f"{p1_prediction_accuracy:.1f}%",
-                    player2: f"{p2_prediction_accuracy:.1f}%"
-                },
-                "match_history": [
-                    {
-                        "date": match[0].strftime("%Y-%m-%d") if match[0] else "N/A",
-                        "predicted_winner": match[1],
-                        "actual_winner": match[2],
-                        "confidence": match[3],
-                        "odds": f"{match[4]:.2f} vs {match[5]:.2f}",
-                        "tournament": match[6],
-                        "surface": match[7],
-                        "recommended_action": match[8]
-                    }
-                    for match in matches
-                ]
-            }
-            
-            return CallToolResult(
-                content=[{"type": "text", "text": json.dumps(result, indent=2)}],
-                isError=False
-            )
-    
-    finally:
-        conn.close()
+    years_back = int(years_back)
+    pool = await get_pool()
+    payload = await pool.fetchval(HEAD_TO_HEAD_SQL, player1, player2, years_back)
+
+    if payload is None:
+        return CallToolResult(
+            content=[{"type": "text", "text": f"No head-to-head matches found between {player1} and {player2} in the last {years_back} years."}],
+            isError=False
+        )
+
+    return CallToolResult(
+        content=[{"type": "text", "text": payload}],
+        isError=False
+    )
 
 async def get_form_analysis(
     players: List[str],
@@ -360,73 +526,65 @@ async def get_form_analysis(
     days_back: int = 90
 ) -> CallToolResult:
     """Analyze recent form for multiple players."""
-    conn = psycopg2.connect(DATABASE_URL)
-    try:
-        with conn.cursor() as cur:
-            player_stats = {}
-            
-            for player in players:
-                query = """
-                    SELECT prediction_day, player1, player2, predicted_winner, actual_winner,
-                           confidence_score, recommended_action, value_bet, odds_player1, odds_player2
-                    FROM predictions 
-                    WHERE (player1 = %s OR player2 = %s)
-                    AND prediction_day >= CURRENT_DATE - INTERVAL '%s days'
-                    ORDER BY prediction_day DESC
-                    LIMIT %s
-                """
-                cur.execute(query, (player, player, days_back, matches_back))
-                matches = cur.fetchall()
-                
-                if matches:
-                    wins = sum(1 for match in matches if match[4] == player)
-                    total_games = len(matches)
-                    win_rate = (wins / total_games * 100) if total_games > 0 else 0
-                    
-                    # Predictions accuracy for this player
-                    predicted_wins = sum(1 for match in matches if match[3] == player)
-                    correct_predictions = sum(1 for match in matches if match[3] == player and match[4] == player)
-                    prediction_accuracy = (correct_predictions / predicted_wins * 100) if predicted_wins > 0 else 0
-                    
-                    # Value bet success rate
-                    value_bets = sum(1 for match in matches if match[7])
-                    value_bet_wins = sum(1 for match in matches if match[7] and match[4] == player)
-                    value_bet_success = (value_bet_wins / value_bets * 100) if value_bets > 0 else 0
-                    
-                    player_stats[player] = {
-                        "matches_analyzed": total_games,
-                        "win_rate": f"{win_rate:.1f}%",
-                        "prediction_accuracy": f"{prediction_accuracy:.1f}%",
-                        "value_bets": value_bets,
-                        "value_bet_success_rate": f"{value_bet_success:.1f}%",
-                        "recent_matches": [
-                            {
-                                "date": match[0].strftime("%Y-%m-%d"),
-                                "opponent": match[1] if match[1] != player else match[2],
-                                "result": "Win" if match[4] == player else "Loss",
-                                "confidence": match[5],
-                                "action": match[6],
-                                "value_bet": "Yes" if match[7] else "No"
-                            }
-                            for match in matches
-                        ]
+    matches_back = int(matches_back)
+    days_back = int(days_back)
+    pool = await get_pool()
+    # Deduplicate so a repeated name doesn't double its window counts
+    players = list(dict.fromkeys(players))
+    rows = await pool.fetch(FORM_ANALYSIS_SQL, players, days_back, matches_back)
+    matches_by_player: Dict[str, list] = {player: [] for player in players}
+    for row in rows:
+        matches_by_player[row["player_name"]].append(row)
+
+    player_stats = {}
+    for player, matches in matches_by_player.items():
+        if matches:
+            summary = matches[0]
+            wins = summary["wins"]
+            total_games = len(matches)
+            win_rate = (wins / total_games * 100) if total_games > 0 else 0
+
+            # Predictions accuracy for this player
+            predicted_wins = summary["predicted_wins"]
+            correct_predictions = summary["correct_predictions"]
+            prediction_accuracy = (correct_predictions / predicted_wins * 100) if predicted_wins > 0 else 0
+
+            # Value bet success rate
+            value_bets = summary["value_bets"]
+            value_bet_wins = summary["value_bet_wins"]
+            value_bet_success = (value_bet_wins / value_bets * 100) if value_bets > 0 else 0
+
+            player_stats[player] = {
+                "matches_analyzed": total_games,
+                "win_rate": f"{win_rate:.1f}%",
+                "prediction_accuracy": f"{prediction_accuracy:.1f}%",
+                "value_bets": value_bets,
+                "value_bet_success_rate": f"{value_bet_success:.1f}%",
+                "recent_matches": [
+                    {
+                        "date": match[0],
+                        "opponent": match[1] if match[1] != player else match[2],
+                        "result": "Win" if match[4] == player else "Loss",
+                        "confidence": match[5],
+                        "action": match[6],
+                        "value_bet": "Yes" if match[7] else "No"
                     }
-                else:
-                    player_stats[player] = {"error": "No recent matches found"}
-            
-            result = {
-                "analysis_period": f"{days_back} days",
-                "matches_per_player": matches_back,
-                "player_stats": player_stats
+                    for match in matches
+                ]
             }
-            
-            return CallToolResult(
-                content=[{"type": "text", "text": json.dumps(result, indent=2)}],
-                isError=False
-            )
-    
-    finally:
-        conn.close()
+        else:
+            player_stats[player] = {"error": "No recent matches found"}
+
+    result = {
+        "analysis_period": f"{days_back} days",
+        "matches_per_player": matches_back,
+        "player_stats": player_stats
+    }
+
+    return CallToolResult(
+        content=[{"type": "text", "text": to_json(result)}],
+        isError=False
+    )
 
 async def get_surface_analysis(
     player_name: str,
@@ -434,51 +592,49 @@ async def get_surface_analysis(
     time_period_days: int = 365
 ) -> CallToolResult:
     """Analyze player performance by court surface."""
-    conn = psycopg2.connect(DATABASE_URL)
-    try:
-        with conn.cursor() as cur:
-            query = """
-                SELECT surface, COUNT(*) as total_matches,
-                       AVG(confidence_score) as avg_confidence,
-                       COUNT(CASE WHEN predicted_winner = actual_winner THEN 1 END) as correct_predictions,
-                       COUNT(CASE WHEN value_bet THEN 1 END) as value_bets,
-                       COUNT(CASE WHEN value_bet AND predicted_winner = actual_winner THEN 1 END) as value_bet_wins
-                FROM predictions 
-                WHERE (player1 = %s OR player2 = %s)
-                AND prediction_day >= CURRENT_DATE - INTERVAL '%s days'
-                GROUP BY surface
-            """
-            cur.execute(query, (player_name, player_name, time_period_days))
-            surface_stats = cur.fetchall()
-            
-            result = {
-                "player": player_name,
-                "period_days": time_period_days,
-                "surface_performance": {}
-            }
-            
-            for surface, total_matches, avg_confidence, correct_predictions, value_bets, value_bet_wins in surface_stats:
-                if surfaces and surface not in surfaces:
-                    continue
-                    
-                accuracy_rate = (correct_predictions / total_matches * 100) if total_matches > 0 else 0
-                value_bet_success_rate = (value_bet_wins / value_bets * 100) if value_bets > 0 else 0
-                
-                result["surface_performance"][surface] = {
-                    "total_matches": total_matches,
-                    "accuracy_rate": f"{accuracy_rate:.1f}%",
-                    "average_confidence": f"{avg_confidence:.1f}" if avg_confidence else "N/A",
-                    "value_bets": value_bets,
-                    "value_bet_success_rate": f"{value_bet_success_rate:.1f}%"
-                }
-            
-            return CallToolResult(
-                content=[{"type": "text", "text": json.dumps(result, indent=2)}],
-                isError=False
-            )
-    
-    finally:
-        conn.close()
+    time_period_days = int(time_period_days)
+    pool = await get_pool()
+    # Reads the player_daily_stats rollup (see database/schema.sql), refreshed
+    # by the scrape scripts after every upload: a primary-key range scan
+    # instead of an OR scan over predictions
+    query = """
+        SELECT surface, SUM(matches) as total_matches,
+               SUM(sum_confidence)::numeric / NULLIF(SUM(matches), 0) as avg_confidence,
+               SUM(correct) as correct_predictions,
+               SUM(value_bets) as value_bets,
+               SUM(value_bet_wins) as value_bet_wins
+        FROM player_daily_stats
+        WHERE player = $1
+        AND day >= CURRENT_DATE - $2::int
+        GROUP BY surface
+    """
+    surface_stats = await pool.fetch(query, player_name, time_period_days)
+
+    result = {
+        "player": player_name,
+        "period_days": time_period_days,
+        "surface_performance": {}
+    }
+
+    for surface, total_matches, avg_confidence, correct_predictions, value_bets, value_bet_wins in surface_stats:
+        if surfaces and surface not in surfaces:
+            continue
+
+        accuracy_rate = (correct_predictions / total_matches * 100) if total_matches > 0 else 0
+        value_bet_success_rate = (value_bet_wins / value_bets * 100) if value_bets > 0 else 0
+
+        result["surface_performance"][surface] = {
+            "total_matches": total_matches,
+            "accuracy_rate": f"{accuracy_rate:.1f}%",
+            "average_confidence": f"{avg_confidence:.1f}" if avg_confidence else "N/A",
+            "value_bets": value_bets,
+            "value_bet_success_rate": f"{value_bet_success_rate:.1f}%"
+        }
+
+    return CallToolResult(
+        content=[{"type": "text", "text": to_json(result)}],
+        isError=False
+    )
 
 # Additional implementations would follow the same pattern...
 # I'll implement a few more key functions to demonstrate the capability
@@ -489,47 +645,30 @@ async def get_tournament_analysis(
     include_surface_breakdown: bool = True
 ) -> CallToolResult:
     """Analyze tournament-specific trends and patterns."""
-    conn = psycopg2.connect(DATABASE_URL)
-    try:
-        with conn.cursor() as cur:
-            year_filter = f"AND EXTRACT(year FROM prediction_day) = {year}" if year else ""
-            
-            query = f"""
-                SELECT surface, COUNT(*) as total_predictions,
-                       AVG(confidence_score) as avg_confidence,
-                       COUNT(CASE WHEN value_bet THEN 1 END) as value_bets,
-                       COUNT(CASE WHEN predicted_winner = actual_winner THEN 1 END) as correct_predictions
-                FROM predictions 
-                WHERE tournament ILIKE %s {year_filter}
-                GROUP BY surface
-                ORDER BY total_predictions DESC
-            """
-            cur.execute(query, (f"%{tournament_name}%",))
-            tournament_stats = cur.fetchall()
-            
-            result = {
-                "tournament": tournament_name,
-                "year": year or "All years",
-                "surface_breakdown": {}
-            }
-            
-            for surface, total_predictions, avg_confidence, value_bets, correct_predictions in tournament_stats:
-                accuracy_rate = (correct_predictions / total_predictions * 100) if total_predictions > 0 else 0
-                
-                result["surface_breakdown"][surface] = {
-                    "total_predictions": total_predictions,
-                    "average_confidence": f"{avg_confidence:.1f}" if avg_confidence else "N/A",
-                    "accuracy_rate": f"{accuracy_rate:.1f}%",
-                    "value_bets": value_bets
-                }
-            
-            return CallToolResult(
-                content=[{"type": "text", "text": json.dumps(result, indent=2)}],
-                isError=False
-            )
-    
-    finally:
-        conn.close()
+    year = int(year) if year else None
+    pool = await get_pool()
+    tournament_stats = await pool.fetch(TOURNAMENT_ANALYSIS_SQL, f"%{tournament_name}%", year)
+
+    result = {
+        "tournament": tournament_name,
+        "year": year or "All years",
+        "surface_breakdown": {}
+    }
+
+    for surface, total_predictions, avg_confidence, value_bets, correct_predictions in tournament_stats:
+        accuracy_rate = (correct_predictions / total_predictions * 100) if total_predictions > 0 else 0
+
+        result["surface_breakdown"][surface] = {
+            "total_predictions": total_predictions,
+            "average_confidence": f"{avg_confidence:.1f}" if avg_confidence else "N/A",
+            "accuracy_rate": f"{accuracy_rate:.1f}%",
+            "value_bets": value_bets
+        }
+
+    return CallToolResult(
+        content=[{"type": "text", "text": to_json(result)}],
+        isError=False
+    )
 
 async def get_odds_analysis(
     date_from: Optional[str] = None,
@@ -538,76 +677,56 @@ async def get_odds_analysis(
     confidence_threshold: int = 70
 ) -> CallToolResult:
     """Analyze betting odds trends and identify value opportunities."""
-    conn = psycopg2.connect(DATABASE_URL)
-    try:
-        with conn.cursor() as cur:
-            date_filter = ""
-            params = []
-            
-            if date_from and date_to:
-                date_filter = "AND prediction_day BETWEEN %s AND %s"
-                params = [date_from, date_to]
-            elif date_from:
-                date_filter = "AND prediction_day >= %s"
-                params = [date_from]
-            elif date_to:
-                date_filter = "AND prediction_day <= %s"
-                params = [date_to]
-            
-            query = f"""
-                SELECT player1, player2, tournament, surface,
-                       predicted_winner, odds_player1, odds_player2,
-                       confidence_score, recommended_action, value_bet,
-                       prediction_day, actual_winner
-                FROM predictions 
-                WHERE confidence_score >= %s
-                AND (odds_player1 >= %s OR odds_player2 >= %s)
-                {date_filter}
-                ORDER BY confidence_score DESC, prediction_day DESC
-                LIMIT 50
-            """
-            params = [confidence_threshold, min_odds, min_odds] + params
-            cur.execute(query, params)
-            odds_data = cur.fetchall()
-            
-            # Analyze odds patterns
-            total_predictions = len(odds_data)
-            value_bets = sum(1 for pred in odds_data if pred[9])
-            high_confidence_predictions = sum(1 for pred in odds_data if pred[7] >= 85)
-            
-            result = {
-                "analysis_period": f"{date_from or 'beginning'} to {date_to or 'today'}",
-                "min_odds_threshold": min_odds,
-                "confidence_threshold": confidence_threshold,
-                "summary": {
-                    "total_predictions": total_predictions,
-                    "value_bets_identified": value_bets,
-                    "high_confidence_predictions": high_confidence_predictions,
-                    "value_bet_rate": f"{(value_bets/total_predictions*100):.1f}%" if total_predictions > 0 else "0%"
-                },
-                "opportunities": [
-                    {
-                        "match": f"{pred[0]} vs {pred[1]}",
-                        "tournament": pred[2],
-                        "surface": pred[3],
-                        "prediction": f"{pred[4]} @ {pred[5]:.2f}" if pred[4] == pred[0] else f"{pred[4]} @ {pred[6]:.2f}",
-                        "confidence": f"{pred[7]}%",
-                        "action": pred[8],
-                        "value_bet": "Yes" if pred[9] else "No",
-                        "date": pred[10].strftime("%Y-%m-%d"),
-                        "result": pred[11] if pred[11] else "Pending"
-                    }
-                    for pred in odds_data
-                ]
-            }
-            
-            return CallToolResult(
-                content=[{"type": "text", "text": json.dumps(result, indent=2)}],
-                isError=False
-            )
-    
-    finally:
-        conn.close()
+    # asyncpg binds DATE parameters from date objects, not strings
+    params = (
+        int(confidence_threshold),
+        float(min_odds),
+        date.fromisoformat(date_from) if date_from else None,
+        date.fromisoformat(date_to) if date_to else None,
+    )
+
+    # Rows stream through a server-side cursor; the summary counts are
+    # tallied as each one is formatted
+    total_predictions = 0
+    value_bets = 0
+    high_confidence_predictions = 0
+
+    def format_prediction(pred: asyncpg.Record) -> Dict[str, Any]:
+        nonlocal total_predictions, value_bets, high_confidence_predictions
+        total_predictions += 1
+        value_bets += 1 if pred[9] else 0
+        high_confidence_predictions += 1 if pred[7] >= 85 else 0
+        return {
+            "match": f"{pred[0]} vs {pred[1]}",
+            "tournament": pred[2],
+            "surface": pred[3],
+            "prediction": f"{pred[4]} @ {pred[5]:.2f}" if pred[4] == pred[0] else f"{pred[4]} @ {pred[6]:.2f}",
+            "confidence": f"{pred[7]}%",
+            "action": pred[8],
+            "value_bet": "Yes" if pred[9] else "No",
+            "date": pred[10],
+            "result": pred[11] if pred[11] else "Pending"
+        }
+
+    opportunities = await fetch_formatted_rows(ODDS_ANALYSIS_SQL, params, format_prediction)
+
+    result = {
+        "analysis_period": f"{date_from or 'beginning'} to {date_to or 'today'}",
+        "min_odds_threshold": min_odds,
+        "confidence_threshold": confidence_threshold,
+        "summary": {
+            "total_predictions": total_predictions,
+            "value_bets_identified": value_bets,
+            "high_confidence_predictions": high_confidence_predictions,
+            "value_bet_rate": f"{(value_bets/total_predictions*100):.1f}%" if total_predictions > 0 else "0%"
+        },
+        "opportunities": opportunities
+    }
+
+    return CallToolResult(
+        content=[{"type": "text", "text": to_json(result)}],
+        isError=False
+    )
 
 async def get_value_opportunities(
     analysis_type: str,
@@ -615,86 +734,79 @@ async def get_value_opportunities(
     limit: int = 15
 ) -> CallToolResult:
     """Identify advanced value betting opportunities."""
-    conn = psycopg2.connect(DATABASE_URL)
-    try:
-        with conn.cursor() as cur:
-            if analysis_type == "statistical":
-                query = """
-                    SELECT player1, player2, tournament, surface, predicted_winner,
-                           odds_player1, odds_player2, confidence_score, prediction_day
-                    FROM predictions 
-                    WHERE confidence_score >= %s
-                    AND (odds_player1 >= 2.0 OR odds_player2 >= 2.0)
-                    AND prediction_day >= CURRENT_DATE - INTERVAL '7 days'
-                    AND actual_winner IS NULL
-                    ORDER BY confidence_score DESC, (odds_player1 + odds_player2)/2 DESC
-                    LIMIT %s
-                """
-            elif analysis_type == "form-based":
-                query = """
-                    SELECT p.player1, p.player2, p.tournament, p.surface, p.predicted_winner,
-                           p.odds_player1, p.odds_player2, p.confidence_score, p.prediction_day
-                    FROM predictions p
-                    LEFT JOIN predictions p2 ON (p.player1 = p2.player1 OR p.player1 = p2.player2 OR 
-                                                p.player2 = p2.player1 OR p.player2 = p2.player2)
-                    WHERE p.confidence_score >= %s
-                    AND p2.prediction_day >= CURRENT_DATE - INTERVAL '30 days'
-                    AND p.actual_winner IS NULL
-                    GROUP BY p.player1, p.player2, p.tournament, p.surface, p.predicted_winner,
-                             p.odds_player1, p.odds_player2, p.confidence_score, p.prediction_day
-                    HAVING COUNT(p2.prediction_id) >= 3
-                    ORDER BY p.confidence_score DESC
-                    LIMIT %s
-                """
-            elif analysis_type == "surface-based":
-                query = """
-                    SELECT p.player1, p.player2, p.tournament, p.surface, p.predicted_winner,
-                           p.odds_player1, p.odds_player2, p.confidence_score, p.prediction_day
-                    FROM predictions p
-                    WHERE p.confidence_score >= %s
-                    AND p.surface IN ('hard', 'clay', 'grass')
-                    AND p.actual_winner IS NULL
-                    ORDER BY 
-                        CASE WHEN p.surface = 'hard' THEN 
-                            (SELECT AVG(confidence_score) FROM predictions 
-                             WHERE (player1 = p.player1 OR player2 = p.player1 OR 
-                                    player1 = p.player2 OR player2 = p.player2) 
-                             AND surface = 'hard') 
-                        END DESC
-                    LIMIT %s
-                """
-            else:
-                return CallToolResult(
-                    content=[{"type": "text", "text": "Invalid analysis type. Choose from: statistical, form-based, surface-based"}],
-                    isError=True
-                )
-            
-            cur.execute(query, (min_confidence, limit))
-            opportunities = cur.fetchall()
-            
-            result = {
-                "analysis_type": analysis_type,
-                "min_confidence": min_confidence,
-                "opportunities": [
-                    {
-                        "match": f"{opp[0]} vs {opp[1]}",
-                        "tournament": opp[2],
-                        "surface": opp[3],
-                        "prediction": f"{opp[4]} @ {opp[5]:.2f}" if opp[4] == opp[0] else f"{opp[4]} @ {opp[6]:.2f}",
-                        "confidence": f"{opp[7]}%",
-                        "date": opp[8].strftime("%Y-%m-%d")
-                    }
-                    for opp in opportunities
-                ]
-            }
-            
-            return CallToolResult(
-                content=[{"type": "text", "text": json.dumps(result, indent=2)}],
-                isError=False
-            )
-    
-    finally:
-        conn.close()
+    if analysis_type == "statistical":
+        query = """
+            SELECT player1, player2, tournament, surface, predicted_winner,
+                   odds_player1, odds_player2, confidence_score, prediction_day
+            FROM predictions
+            WHERE confidence_score >= $1
+            AND (odds_player1 >= 2.0 OR odds_player2 >= 2.0)
+            AND prediction_day >= CURRENT_DATE - INTERVAL '7 days'
+            AND actual_winner IS NULL
+            ORDER BY confidence_score DESC, (odds_player1 + odds_player2)/2 DESC
+            LIMIT $2
+        """
+    elif analysis_type == "form-based":
+        query = """
+            SELECT p.player1, p.player2, p.tournament, p.surface, p.predicted_winner,
+                   p.odds_player1, p.odds_player2, p.confidence_score, p.prediction_day
+            FROM predictions p
+            LEFT JOIN predictions p2 ON (p.player1 = p2.player1 OR p.player1 = p2.player2 OR
+                                        p.player2 = p2.player1 OR p.player2 = p2.player2)
+            WHERE p.confidence_score >= $1
+            AND p2.prediction_day >= CURRENT_DATE - INTERVAL '30 days'
+            AND p.actual_winner IS NULL
+            GROUP BY p.player1, p.player2, p.tournament, p.surface, p.predicted_winner,
+                     p.odds_player1, p.odds_player2, p.confidence_score, p.prediction_day
+            HAVING COUNT(p2.prediction_id) >= 3
+            ORDER BY p.confidence_score DESC
+            LIMIT $2
+        """
+    elif analysis_type == "surface-based":
+        query = """
+            SELECT p.player1, p.player2, p.tournament, p.surface, p.predicted_winner,
+                   p.odds_player1, p.odds_player2, p.confidence_score, p.prediction_day
+            FROM predictions p
+            LEFT JOIN mv_player_surface_stats s1 ON s1.player = p.player1 AND s1.surface = p.surface
+            LEFT JOIN mv_player_surface_stats s2 ON s2.player = p.player2 AND s2.surface = p.surface
+            WHERE p.confidence_score >= $1
+            AND p.surface IN ('hard', 'clay', 'grass')
+            AND p.actual_winner IS NULL
+            ORDER BY
+                -- Both players' combined average confidence on this surface,
+                -- from the precomputed view instead of a per-row subquery
+                (COALESCE(s1.sum_confidence, 0) + COALESCE(s2.sum_confidence, 0))::numeric
+                    / NULLIF(COALESCE(s1.matches, 0) + COALESCE(s2.matches, 0), 0) DESC NULLS LAST
+            LIMIT $2
+        """
+    else:
+        return CallToolResult(
+            content=[{"type": "text", "text": "Invalid analysis type. Choose from: statistical, form-based, surface-based"}],
+            isError=True
+        )
+
+    def format_opportunity(opp: asyncpg.Record) -> Dict[str, Any]:
+        return {
+            "match": f"{opp[0]} vs {opp[1]}",
+            "tournament": opp[2],
+            "surface": opp[3],
+            "prediction": f"{opp[4]} @ {opp[5]:.2f}" if opp[4] == opp[0] else f"{opp[4]} @ {opp[6]:.2f}",
+            "confidence": f"{opp[7]}%",
+            "date": opp[8]
+        }
+
+    opportunities = await fetch_formatted_rows(query, (int(min_confidence), int(limit)), format_opportunity)
+
+    result = {
+        "analysis_type": analysis_type,
+        "min_confidence": min_confidence,
+        "opportunities": opportunities
+    }
+
+    return CallToolResult(
+        content=[{"type": "text", "text": to_json(result)}],
+        isError=False
+    )
 
 async def get_performance_trends(
     player_name: str,
@@ -703,88 +815,82 @@ async def get_performance_trends(
     aggregation: str = "weekly"
 ) -> CallToolResult:
     """Analyze time-series performance data for trends."""
-    conn = psycopg2.connect(DATABASE_URL)
-    try:
-        with conn.cursor() as cur:
-            # Determine time grouping
-            if aggregation == "daily":
-                time_format = "DATE(prediction_day)"
-            elif aggregation == "weekly":
-                time_format = "DATE_TRUNC('week', prediction_day)"
-            else:  # monthly
-                time_format = "DATE_TRUNC('month', prediction_day)"
-            
-            if metric == "confidence_score":
-                agg_function = "AVG(confidence_score)"
-            elif metric == "win_rate":
-                agg_function = """
-                    COUNT(CASE WHEN predicted_winner = actual_winner THEN 1 END) * 100.0 / COUNT(*)
-                """
-            elif metric == "odds_accuracy":
-                agg_function = """
-                    COUNT(CASE WHEN predicted_winner = actual_winner THEN 1 END) * 100.0 / COUNT(*)
-                """
-            else:
-                return CallToolResult(
-                    content=[{"type": "text": f"Invalid metric: {metric}. Choose from: confidence_score, win_rate, odds_accuracy"}],
-                    isError=True
-                )
-            
-            query = f"""
-                SELECT {time_format} as period, {agg_function} as metric_value
-                FROM predictions 
-                WHERE (player1 = %s OR player2 = %s)
-                AND prediction_day >= CURRENT_DATE - INTERVAL '%s days'
-                GROUP BY {time_format}
-                ORDER BY period
-            """
-            cur.execute(query, (player_name, player_name, period_days))
-            trend_data = cur.fetchall()
-            
-            # Calculate trend
-            if len(trend_data) >= 2:
-                recent_avg = sum(row[1] for row in trend_data[-3:]) / min(3, len(trend_data))
-                earlier_avg = sum(row[1] for row in trend_data[:3]) / min(3, len(trend_data))
-                trend_direction = "improving" if recent_avg > earlier_avg else "declining" if recent_avg < earlier_avg else "stable"
-                trend_change = ((recent_avg - earlier_avg) / earlier_avg * 100) if earlier_avg > 0 else 0
-            else:
-                trend_direction = "insufficient_data"
-                trend_change = 0
-            
-            result = {
-                "player": player_name,
-                "metric": metric,
-                "period_days": period_days,
-                "aggregation": aggregation,
-                "trend_direction": trend_direction,
-                "trend_change_percentage": f"{trend_change:.1f}%",
-                "data_points": [
-                    {
-                        "period": row[0].strftime("%Y-%m-%d") if hasattr(row[0], 'strftime') else str(row[0]),
-                        "value": f"{row[1]:.1f}" if metric == "confidence_score" else f"{row[1]:.1f}%"
-                    }
-                    for row in trend_data
-                ]
+    period_days = int(period_days)
+
+    # Time grouping is a bound date_trunc unit; anything else means monthly
+    trunc_unit = TREND_TRUNC_UNITS.get(aggregation, "month")
+
+    query = TREND_SQL.get(metric)
+    if query is None:
+        return CallToolResult(
+            content=[{"type": "text", "text": f"Invalid metric: {metric}. Choose from: {', '.join(TREND_SQL)}"}],
+            isError=True
+        )
+
+    pool = await get_pool()
+    trend_data = await pool.fetch(query, player_name, period_days, trunc_unit)
+
+    if trend_data and trend_data[0]["buckets"] >= 2:
+        summary = trend_data[0]
+        recent_avg, earlier_avg = summary["recent_avg"], summary["earlier_avg"]
+        trend_direction = "improving" if recent_avg > earlier_avg else "declining" if recent_avg < earlier_avg else "stable"
+        trend_change = summary["trend_change"]
+    else:
+        trend_direction = "insufficient_data"
+        trend_change = 0
+
+    # Periods are dates (serialized as YYYY-MM-DD by orjson); the value format
+    # depends only on the metric, so pick it once rather than per row
+    value_format = "{:.1f}" if metric == "confidence_score" else "{:.1f}%"
+
+    result = {
+        "player": player_name,
+        "metric": metric,
+        "period_days": period_days,
+        "aggregation": aggregation,
+        "trend_direction": trend_direction,
+        "trend_change_percentage": f"{trend_change:.1f}%",
+        "data_points": [
+            {
+                "period": row[0],
+                "value": value_format.format(row[1])
             }
-            
-            return CallToolResult(
-                content=[{"type": "text", "text": json.dumps(result, indent=2)}],
-                isError=False
-            )
-    
-    finally:
-        conn.close()
+            for row in trend_data
+        ]
+    }
 
-if __name__ == "__main__":
-    import sys
+    return CallToolResult(
+        content=[{"type": "text", "text": to_json(result)}],
+        isError=False
+    )
+
+# Tool name -> handler, looked up by execute_tool
+TOOL_HANDLERS: Dict[str, Callable[..., Awaitable[CallToolResult]]] = {
+    "get_player_stats": get_player_stats,
+    "get_tournament_analysis": get_tournament_analysis,
+    "get_head_to_head": get_head_to_head,
+    "get_form_analysis": get_form_analysis,
+    "get_surface_analysis": get_surface_analysis,
+    "get_odds_analysis": get_odds_analysis,
+    "get_value_opportunities": get_value_opportunities,
+    "get_performance_trends": get_performance_trends,
+}
+
+async def main():
+    """Serve the MCP tools over stdio until the client disconnects."""
     from mcp.server.stdio import stdio_server
-    
-    async def main():
+
+    # Open the pool up front so the first tool call doesn't pay for it
+    pool = await get_pool()
+    try:
         async with stdio_server() as (read_stream, write_stream):
             await server.run(
                 read_stream,
                 write_stream,
                 server.create_initialization_options(),
             )
-    
+    finally:
+        await pool.close()
+
+if __name__ == "__main__":
     asyncio.run(main())
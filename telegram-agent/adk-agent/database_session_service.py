@@ -12,12 +12,13 @@ Features:
 - User context preservation across sessions
 """
 
-import json
+import asyncio
 import os
 from datetime import datetime
 from typing import Any, Dict, List, Optional, AsyncGenerator
 
-import psycopg2
+import asyncpg
+import orjson
 from dotenv import load_dotenv
 from google.adk.sessions import BaseSessionService
 from google.adk.events import Event
@@ -26,6 +27,302 @@ from google.genai.types import Content, Part
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+EVENTS_CURSOR_PREFETCH = int(os.getenv("EVENTS_CURSOR_PREFETCH", "200"))
+# Event batches larger than this are written with COPY instead of INSERT
+EVENTS_COPY_THRESHOLD = int(os.getenv("EVENTS_COPY_THRESHOLD", "500"))
+
+# Bump whenever _initialize_database's DDL changes so existing databases pick
+# it up; at the recorded version, startup skips the DDL entirely
+SESSION_SCHEMA_VERSION = 2
+
+# Process-wide asyncpg pool shared by every DatabaseSessionService, created
+# (and the schema initialized) on first use from inside the event loop.
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+# jsonb's binary wire format is a version byte followed by the JSON text
+_JSONB_VERSION = b"\x01"
+
+def _encode_jsonb(value: Any) -> bytes:
+    return _JSONB_VERSION + orjson.dumps(value)
+
+def _decode_jsonb(data: bytes) -> Any:
+    return orjson.loads(data[1:])
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    # JSONB in and out as Python dicts/lists, as psycopg2 did, via orjson
+    # on both sides of every state/metadata/event write and read. The codec
+    # is binary so binary COPY (copy_records_to_table) can encode it too.
+    await conn.set_type_codec(
+        "jsonb", encoder=_encode_jsonb, decoder=_decode_jsonb,
+        schema="pg_catalog", format="binary",
+    )
+
+async def _get_pool() -> asyncpg.Pool:
+    """Return the shared pool, creating it and the session schema on first use."""
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                pool = await asyncpg.create_pool(
+                    DATABASE_URL,
+                    min_size=DB_POOL_MIN_SIZE,
+                    max_size=DB_POOL_MAX_SIZE,
+                    statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+                    init=_init_connection,
+                )
+                # A failed schema init must not leave an open pool behind, and
+                # _pool stays None so the next call retries from scratch
+                try:
+                    async with pool.acquire() as conn:
+                        await _initialize_database(conn)
+                except Exception:
+                    await pool.close()
+                    raise
+                _pool = pool
+    return _pool
+
+async def _schema_version(conn: asyncpg.Connection) -> int:
+    """Version recorded in session_schema_meta, or 0 before the first migration."""
+    if not await conn.fetchval("SELECT to_regclass('session_schema_meta') IS NOT NULL"):
+        return 0
+    return await conn.fetchval("SELECT COALESCE(MAX(version), 0) FROM session_schema_meta")
+
+async def _initialize_database(conn: asyncpg.Connection) -> None:
+    """
+    Initialize the database schema for session storage.
+
+    The DDL only runs when session_schema_meta is behind SESSION_SCHEMA_VERSION,
+    so an up-to-date database costs one or two catalog reads per process start
+    instead of a round of CREATE ... IF NOT EXISTS statements and their locks.
+    """
+    try:
+        if await _schema_version(conn) >= SESSION_SCHEMA_VERSION:
+            return
+
+        async with conn.transaction():
+            # Serialize concurrent cold starts, then re-check under the lock
+            await conn.execute("SELECT pg_advisory_xact_lock(hashtext('session_schema_meta'))")
+            if await _schema_version(conn) >= SESSION_SCHEMA_VERSION:
+                return
+
+            # Create enhanced sessions table
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS agent_sessions (
+                    session_id VARCHAR(255) PRIMARY KEY,
+                    user_id VARCHAR(255) NOT NULL,
+                    app_name VARCHAR(255) NOT NULL,
+                    state JSONB DEFAULT '{}',
+                    metadata JSONB DEFAULT '{}',
+                    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                    last_activity TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                    conversation_count INTEGER DEFAULT 0,
+                    total_events INTEGER DEFAULT 0
+                );
+            """)
+
+            # Event history lives only in session_events. Older databases
+            # still carry an unused events column; dropping it loses data, so
+            # that is left to database/drop_agent_sessions_events.sql.
+
+            # Create indexes for performance
+            # list_sessions filters on (user_id, app_name) and sorts by
+            # last_activity: this index returns rows already in order, and
+            # INCLUDE makes it an index-only scan. It replaces the old
+            # (user_id, session_id) / (app_name, session_id) pair, which
+            # nothing could use (session_id lookups go through the PK).
+            await conn.execute("DROP INDEX IF EXISTS idx_user_session;")
+            await conn.execute("DROP INDEX IF EXISTS idx_app_session;")
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_user_app_activity
+                ON agent_sessions (user_id, app_name, last_activity DESC) INCLUDE (session_id);
+            """)
+            await conn.execute("CREATE INDEX IF NOT EXISTS idx_last_activity ON agent_sessions (last_activity);")
+            await conn.execute("CREATE INDEX IF NOT EXISTS idx_updated_at ON agent_sessions (updated_at);")
+
+            # Nothing in the agent queries state/metadata, and every
+            # update_session rewrites both, so GIN indexes on them only add
+            # write cost per turn; they are opt-in via
+            # database/agent_session_indexes.sql. Version 1 created them here.
+            await conn.execute("DROP INDEX IF EXISTS idx_agent_sessions_state_gin;")
+            await conn.execute("DROP INDEX IF EXISTS idx_agent_sessions_metadata_gin;")
+
+            # Create session events table for detailed event tracking
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS session_events (
+                    event_id SERIAL PRIMARY KEY,
+                    session_id VARCHAR(255) NOT NULL,
+                    user_id VARCHAR(255) NOT NULL,
+                    app_name VARCHAR(255) NOT NULL,
+                    event_type VARCHAR(50) NOT NULL,
+                    event_data JSONB NOT NULL,
+                    timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+
+                    -- Foreign key constraint
+                    FOREIGN KEY (session_id) REFERENCES agent_sessions(session_id) ON DELETE CASCADE
+                );
+            """)
+
+            # Create indexes for session_events
+            # Matches get_session_events' keyset order, so each page is a
+            # bounded index range scan; supersedes (session_id, timestamp)
+            await conn.execute("DROP INDEX IF EXISTS idx_session_timestamp;")
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_session_timestamp_event
+                ON session_events (session_id, timestamp DESC, event_id DESC);
+            """)
+            await conn.execute("CREATE INDEX IF NOT EXISTS idx_user_timestamp ON session_events (user_id, timestamp);")
+
+            # Create user context table for storing user preferences and history
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS user_context (
+                    user_id VARCHAR(255) PRIMARY KEY,
+                    app_name VARCHAR(255) NOT NULL,
+                    user_preferences JSONB DEFAULT '{}',
+                    interaction_stats JSONB DEFAULT '{}',
+                    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
+
+            # Create unique constraint and index for user_context
+            await conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_user_app ON user_context (user_id, app_name);")
+
+            await conn.execute("CREATE TABLE IF NOT EXISTS session_schema_meta (version INTEGER NOT NULL);")
+            await conn.execute("DELETE FROM session_schema_meta;")
+            await conn.execute("INSERT INTO session_schema_meta (version) VALUES ($1);", SESSION_SCHEMA_VERSION)
+
+        print(f"Database session service schema migrated to version {SESSION_SCHEMA_VERSION}")
+
+    except Exception as e:
+        print(f"Error initializing database session service: {e}")
+        raise
+
+# Hot statements are module-level constants so every call sends identical
+# text: asyncpg prepares statements per connection and caches them by query
+# text, so after the first call on a connection there is no parse/plan step.
+
+# get_session: existence check (ADK only accepts the id fields back)
+GET_SESSION_SQL = """
+    SELECT state, metadata, conversation_count, total_events, created_at, updated_at
+    FROM agent_sessions 
+    WHERE session_id = $1 AND user_id = $2 AND app_name = $3
+"""
+
+LIST_SESSIONS_SQL = """
+    SELECT session_id 
+    FROM agent_sessions 
+    WHERE user_id = $1 AND app_name = $2
+    ORDER BY last_activity DESC
+"""
+
+# update_session: upsert the session, merging state/metadata server-side
+# (JSONB || is a shallow object merge) and bumping counters, and seed the
+# user context when the session is new (xmax = 0 only for freshly inserted
+# rows) -- a new user's first turn is one statement, not update-miss-create.
+# Returns 0 if the session id belongs to another user/app. Events are
+# appended to session_events, never to this row.
+UPSERT_SESSION_SQL = """
+    WITH s AS (
+        INSERT INTO agent_sessions 
+        (session_id, user_id, app_name, state, metadata, conversation_count, total_events)
+        VALUES ($5, $6, $7, $1::jsonb, $2::jsonb, $3, $4)
+        ON CONFLICT (session_id) DO UPDATE SET
+            state = COALESCE(agent_sessions.state, '{}'::jsonb) || EXCLUDED.state,
+            metadata = COALESCE(agent_sessions.metadata, '{}'::jsonb) || EXCLUDED.metadata,
+            last_activity = CURRENT_TIMESTAMP,
+            conversation_count = agent_sessions.conversation_count + EXCLUDED.conversation_count,
+            total_events = agent_sessions.total_events + EXCLUDED.total_events,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE agent_sessions.user_id = EXCLUDED.user_id
+        AND agent_sessions.app_name = EXCLUDED.app_name
+        RETURNING user_id, app_name, (xmax = 0) AS inserted
+    ),
+    ctx AS (
+        INSERT INTO user_context (user_id, app_name, user_preferences, interaction_stats)
+        SELECT user_id, app_name, '{}', '{}' FROM s WHERE inserted
+        ON CONFLICT (user_id, app_name) DO NOTHING
+    )
+    SELECT count(*) FROM s
+"""
+
+INSERT_SESSION_EVENT_SQL = """
+    INSERT INTO session_events 
+    (session_id, user_id, app_name, event_type, event_data)
+    VALUES ($1, $2, $3, $4, $5::jsonb)
+"""
+
+GET_USER_CONTEXT_SQL = """
+    SELECT user_preferences, interaction_stats, created_at, updated_at
+    FROM user_context 
+    WHERE user_id = $1 AND app_name = $2
+"""
+
+# update_user_context: one atomic UPSERT merging the new keys server-side
+UPDATE_USER_CONTEXT_SQL = """
+    INSERT INTO user_context 
+    (user_id, app_name, user_preferences, interaction_stats)
+    VALUES ($1, $2, $3::jsonb, $4::jsonb)
+    ON CONFLICT (user_id, app_name) DO UPDATE SET
+        user_preferences = COALESCE(user_context.user_preferences, '{}'::jsonb) || EXCLUDED.user_preferences,
+        interaction_stats = COALESCE(user_context.interaction_stats, '{}'::jsonb) || EXCLUDED.interaction_stats,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+SESSION_EVENT_COLUMNS = ["session_id", "user_id", "app_name", "event_type", "event_data"]
+
+async def _insert_session_events(conn: asyncpg.Connection, rows: List[tuple]) -> None:
+    """
+    Append (session_id, user_id, app_name, event_type, event_data) rows.
+
+    Normal turns go through a pipelined executemany; large batches (replays,
+    imports) use binary COPY, which skips per-row statement execution.
+    """
+    if len(rows) > EVENTS_COPY_THRESHOLD:
+        await conn.copy_records_to_table("session_events", records=rows, columns=SESSION_EVENT_COLUMNS)
+    else:
+        await conn.executemany(INSERT_SESSION_EVENT_SQL, rows)
+
+# create_session: session upsert and user context seeding in one round trip
+CREATE_SESSION_SQL = """
+    WITH s AS (
+        INSERT INTO agent_sessions 
+        (session_id, user_id, app_name, state, metadata)
+        VALUES ($1, $2, $3, $4::jsonb, $5::jsonb)
+        ON CONFLICT (session_id) DO UPDATE SET
+            state = COALESCE(agent_sessions.state, '{}'),
+            metadata = COALESCE(agent_sessions.metadata, '{}'),
+            last_activity = CURRENT_TIMESTAMP,
+            updated_at = CURRENT_TIMESTAMP
+        RETURNING user_id, app_name
+    )
+    INSERT INTO user_context (user_id, app_name, user_preferences, interaction_stats)
+    SELECT user_id, app_name, '{}', '{}' FROM s
+    ON CONFLICT (user_id, app_name) DO NOTHING
+"""
+
+# get_session_events pages: the first page, and every later page seeked
+# past the previous page's last (timestamp, event_id) instead of OFFSET
+SESSION_EVENTS_SQL = """
+    SELECT event_id, event_type, event_data, timestamp
+    FROM session_events 
+    WHERE session_id = $1 AND user_id = $2 AND app_name = $3
+    ORDER BY timestamp DESC, event_id DESC
+    LIMIT $4
+"""
+
+SESSION_EVENTS_BEFORE_SQL = """
+    SELECT event_id, event_type, event_data, timestamp
+    FROM session_events 
+    WHERE session_id = $1 AND user_id = $2 AND app_name = $3
+    AND (timestamp, event_id) < ($5, $6)
+    ORDER BY timestamp DESC, event_id DESC
+    LIMIT $4
+"""
 
 class DatabaseSessionService(BaseSessionService):
     """
@@ -35,83 +332,6 @@ class DatabaseSessionService(BaseSessionService):
     to remember conversations across restarts and share memory between instances.
     """
     
-    def __init__(self):
-        self.connection_pool = None
-        self._initialize_database()
-    
-    def _initialize_database(self):
-        """Initialize the database schema for session storage."""
-        conn = psycopg2.connect(DATABASE_URL)
-        try:
-            with conn.cursor() as cur:
-                # Create enhanced sessions table
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS agent_sessions (
-                        session_id VARCHAR(255) PRIMARY KEY,
-                        user_id VARCHAR(255) NOT NULL,
-                        app_name VARCHAR(255) NOT NULL,
-                        events JSONB DEFAULT '[]',
-                        state JSONB DEFAULT '{}',
-                        metadata JSONB DEFAULT '{}',
-                        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                        last_activity TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                        conversation_count INTEGER DEFAULT 0,
-                        total_events INTEGER DEFAULT 0
-                    );
-                """)
-                
-                # Create indexes for performance
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_user_session ON agent_sessions (user_id, session_id);")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_app_session ON agent_sessions (app_name, session_id);")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_last_activity ON agent_sessions (last_activity);")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_updated_at ON agent_sessions (updated_at);")
-                
-                # Create session events table for detailed event tracking
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS session_events (
-                        event_id SERIAL PRIMARY KEY,
-                        session_id VARCHAR(255) NOT NULL,
-                        user_id VARCHAR(255) NOT NULL,
-                        app_name VARCHAR(255) NOT NULL,
-                        event_type VARCHAR(50) NOT NULL,
-                        event_data JSONB NOT NULL,
-                        timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                        
-                        -- Foreign key constraint
-                        FOREIGN KEY (session_id) REFERENCES agent_sessions(session_id) ON DELETE CASCADE
-                    );
-                """)
-                
-                # Create indexes for session_events
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_session_timestamp ON session_events (session_id, timestamp);")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_user_timestamp ON session_events (user_id, timestamp);")
-                
-                # Create user context table for storing user preferences and history
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS user_context (
-                        user_id VARCHAR(255) PRIMARY KEY,
-                        app_name VARCHAR(255) NOT NULL,
-                        user_preferences JSONB DEFAULT '{}',
-                        interaction_stats JSONB DEFAULT '{}',
-                        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-                    );
-                """)
-                
-                # Create unique constraint and index for user_context
-                cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_user_app ON user_context (user_id, app_name);")
-                
-                conn.commit()
-                print("Database session service initialized successfully")
-                
-        except Exception as e:
-            print(f"Error initializing database session service: {e}")
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
-    
     async def create_session(
         self,
         app_name: str,
@@ -121,46 +341,15 @@ class DatabaseSessionService(BaseSessionService):
         metadata: Optional[Dict[str, Any]] = None
     ) -> None:
         """Create a new session with initial state and metadata."""
-        conn = psycopg2.connect(DATABASE_URL)
+        pool = await _get_pool()
         try:
-            with conn.cursor() as cur:
-                initial_state = initial_state or {}
-                metadata = metadata or {}
-                
-                # Convert to ADK expected format with camelCase fields and limit to required fields only
-                session_data = {
-                    'id': session_id,
-                    'appName': app_name, 
-                    'userId': user_id
-                    # ADK expects only these required fields, no extras
-                }
-                
-                cur.execute("""
-                    INSERT INTO agent_sessions 
-                    (session_id, user_id, app_name, state, metadata)
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT (session_id) DO UPDATE SET
-                        state = COALESCE(agent_sessions.state, '{}'),
-                        metadata = COALESCE(agent_sessions.metadata, '{}'),
-                        last_activity = CURRENT_TIMESTAMP,
-                        updated_at = CURRENT_TIMESTAMP
-                """, (session_id, user_id, app_name, json.dumps(initial_state), json.dumps(metadata)))
-                
-                # Initialize user context if not exists
-                cur.execute("""
-                    INSERT INTO user_context (user_id, app_name, user_preferences, interaction_stats)
-                    VALUES (%s, %s, '{}', '{}')
-                    ON CONFLICT (user_id, app_name) DO NOTHING
-                """, (user_id, app_name))
-                
-                conn.commit()
-                
+            await pool.execute(
+                CREATE_SESSION_SQL,
+                session_id, user_id, app_name, initial_state or {}, metadata or {}
+            )
         except Exception as e:
             print(f"Error creating session: {e}")
-            conn.rollback()
             raise
-        finally:
-            conn.close()
     
     async def get_session(
         self,
@@ -169,31 +358,23 @@ class DatabaseSessionService(BaseSessionService):
         session_id: str
     ) -> Optional[Dict[str, Any]]:
         """Retrieve session data by ID."""
-        conn = psycopg2.connect(DATABASE_URL)
+        pool = await _get_pool()
         try:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT state, metadata, events, conversation_count, total_events, created_at, updated_at
-                    FROM agent_sessions 
-                    WHERE session_id = %s AND user_id = %s AND app_name = %s
-                """, (session_id, user_id, app_name))
-                
-                result = cur.fetchone()
-                if result:
-                    # Return data in ADK expected format with ONLY required fields
-                    return {
-                        "id": session_id,
-                        "appName": app_name,
-                        "userId": user_id,
-                        # Note: ADK rejects extra fields like metadata, state, etc.
-                    }
-                return None
-                
+            result = await pool.fetchrow(GET_SESSION_SQL, session_id, user_id, app_name)
+            
+            if result:
+                # Return data in ADK expected format with ONLY required fields
+                return {
+                    "id": session_id,
+                    "appName": app_name,
+                    "userId": user_id,
+                    # Note: ADK rejects extra fields like metadata, state, etc.
+                }
+            return None
+            
         except Exception as e:
             print(f"Error retrieving session: {e}")
             return None
-        finally:
-            conn.close()
     
     async def list_sessions(
         self,
@@ -201,23 +382,15 @@ class DatabaseSessionService(BaseSessionService):
         user_id: str
     ) -> List[str]:
         """List all session IDs for a user."""
-        conn = psycopg2.connect(DATABASE_URL)
+        pool = await _get_pool()
         try:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT session_id 
-                    FROM agent_sessions 
-                    WHERE user_id = %s AND app_name = %s
-                    ORDER BY last_activity DESC
-                """, (user_id, app_name))
-                
-                return [row[0] for row in cur.fetchall()]
-                
+            rows = await pool.fetch(LIST_SESSIONS_SQL, user_id, app_name)
+            
+            return [row[0] for row in rows]
+            
         except Exception as e:
             print(f"Error listing sessions: {e}")
             return []
-        finally:
-            conn.close()
     
     async def update_session(
         self,
@@ -230,87 +403,41 @@ class DatabaseSessionService(BaseSessionService):
         add_conversation: bool = False
     ) -> None:
         """Update session with new state, events, or metadata."""
-        conn = psycopg2.connect(DATABASE_URL)
+        pool = await _get_pool()
         try:
-            with conn.cursor() as cur:
-                # Get current session data
-                cur.execute("""
-                    SELECT state, events, metadata, conversation_count, total_events
-                    FROM agent_sessions 
-                    WHERE session_id = %s AND user_id = %s AND app_name = %s
-                """, (session_id, user_id, app_name))
+            # Session upsert (creating it and the user context if needed) and
+            # the event append share one transaction and one commit
+            async with pool.acquire() as conn, conn.transaction():
+                upserted = await conn.fetchval(UPSERT_SESSION_SQL,
+                    state or {},
+                    metadata or {},
+                    1 if add_conversation else 0,
+                    len(events) if events else 0,
+                    session_id,
+                    user_id,
+                    app_name
+                )
                 
-                current = cur.fetchone()
-                if not current:
-                    # Create session if it doesn't exist
-                    await self.create_session(app_name, user_id, session_id, state, metadata)
+                if not upserted:
+                    print(f"Session {session_id} belongs to another user/app; not updated")
                     return
                 
-                current_state, current_events, current_metadata, conv_count, total_events = current
-                
-                # Merge state
-                if state is not None:
-                    new_state = {**(current_state or {}), **state}
-                else:
-                    new_state = current_state or {}
-                
-                # Merge metadata
-                if metadata is not None:
-                    new_metadata = {**(current_metadata or {}), **metadata}
-                else:
-                    new_metadata = current_metadata or {}
-                
-                # Add events
-                new_events = (current_events or []) + (events or [])
-                
-                # Update counters
-                new_conv_count = conv_count + (1 if add_conversation else 0)
-                new_total_events = total_events + (len(events) if events else 0)
-                
-                cur.execute("""
-                    UPDATE agent_sessions 
-                    SET state = %s,
-                        events = %s,
-                        metadata = %s,
-                        last_activity = CURRENT_TIMESTAMP,
-                        conversation_count = %s,
-                        total_events = %s,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE session_id = %s AND user_id = %s AND app_name = %s
-                """, (
-                    json.dumps(new_state), 
-                    json.dumps(new_events), 
-                    json.dumps(new_metadata),
-                    new_conv_count,
-                    new_total_events,
-                    session_id, 
-                    user_id, 
-                    app_name
-                ))
-                
                 # Store individual events in session_events table
                 if events:
-                    for event_data in events:
-                        cur.execute("""
-                            INSERT INTO session_events 
-                            (session_id, user_id, app_name, event_type, event_data)
-                            VALUES (%s, %s, %s, %s, %s)
-                        """, (
-                            session_id, 
-                            user_id, 
-                            app_name, 
+                    await _insert_session_events(conn, [
+                        (
+                            session_id,
+                            user_id,
+                            app_name,
                             event_data.get('type', 'unknown'),
-                            json.dumps(event_data)
-                        ))
-                
-                conn.commit()
+                            event_data
+                        )
+                        for event_data in events
+                    ])
                 
         except Exception as e:
             print(f"Error updating session: {e}")
-            conn.rollback()
             raise
-        finally:
-            conn.close()
     
     async def delete_session(
         self,
@@ -319,31 +446,27 @@ class DatabaseSessionService(BaseSessionService):
         session_id: str
     ) -> bool:
         """Delete a session and its associated events."""
-        conn = psycopg2.connect(DATABASE_URL)
+        pool = await _get_pool()
         try:
-            with conn.cursor() as cur:
+            async with pool.acquire() as conn, conn.transaction():
                 # Delete session events first (due to foreign key constraint)
-                cur.execute("""
+                await conn.execute("""
                     DELETE FROM session_events 
-                    WHERE session_id = %s AND user_id = %s AND app_name = %s
-                """, (session_id, user_id, app_name))
+                    WHERE session_id = $1 AND user_id = $2 AND app_name = $3
+                """, session_id, user_id, app_name)
                 
                 # Delete session
-                cur.execute("""
+                status = await conn.execute("""
                     DELETE FROM agent_sessions 
-                    WHERE session_id = %s AND user_id = %s AND app_name = %s
-                """, (session_id, user_id, app_name))
-                
-                deleted = cur.rowcount > 0
-                conn.commit()
-                return deleted
+                    WHERE session_id = $1 AND user_id = $2 AND app_name = $3
+                """, session_id, user_id, app_name)
                 
+                # Command status is "DELETE <rowcount>"
+                return int(status.rsplit(' ', 1)[-1]) > 0
+            
         except Exception as e:
             print(f"Error deleting session: {e}")
-            conn.rollback()
             return False
-        finally:
-            conn.close()
     
     async def delete_user_sessions(
         self,
@@ -351,31 +474,26 @@ class DatabaseSessionService(BaseSessionService):
         user_id: str
     ) -> int:
         """Delete all sessions for a user."""
-        conn = psycopg2.connect(DATABASE_URL)
+        pool = await _get_pool()
         try:
-            with conn.cursor() as cur:
+            async with pool.acquire() as conn, conn.transaction():
                 # Delete session events first
-                cur.execute("""
+                await conn.execute("""
                     DELETE FROM session_events 
-                    WHERE user_id = %s AND app_name = %s
-                """, (user_id, app_name))
+                    WHERE user_id = $1 AND app_name = $2
+                """, user_id, app_name)
                 
                 # Delete sessions
-                cur.execute("""
+                status = await conn.execute("""
                     DELETE FROM agent_sessions 
-                    WHERE user_id = %s AND app_name = %s
-                """, (user_id, app_name))
-                
-                deleted_count = cur.rowcount
-                conn.commit()
-                return deleted_count
+                    WHERE user_id = $1 AND app_name = $2
+                """, user_id, app_name)
                 
+                return int(status.rsplit(' ', 1)[-1])
+            
         except Exception as e:
             print(f"Error deleting user sessions: {e}")
-            conn.rollback()
             return 0
-        finally:
-            conn.close()
     
     async def get_user_context(
         self,
@@ -383,30 +501,22 @@ class DatabaseSessionService(BaseSessionService):
         user_id: str
     ) -> Optional[Dict[str, Any]]:
         """Get user context and preferences."""
-        conn = psycopg2.connect(DATABASE_URL)
+        pool = await _get_pool()
         try:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT user_preferences, interaction_stats, created_at, updated_at
-                    FROM user_context 
-                    WHERE user_id = %s AND app_name = %s
-                """, (user_id, app_name))
-                
-                result = cur.fetchone()
-                if result:
-                    return {
-                        "user_preferences": result[0] or {},
-                        "interaction_stats": result[1] or {},
-                        "created_at": result[2],
-                        "updated_at": result[3]
-                    }
-                return None
-                
+            result = await pool.fetchrow(GET_USER_CONTEXT_SQL, user_id, app_name)
+            
+            if result:
+                return {
+                    "user_preferences": result[0] or {},
+                    "interaction_stats": result[1] or {},
+                    "created_at": result[2],
+                    "updated_at": result[3]
+                }
+            return None
+            
         except Exception as e:
             print(f"Error retrieving user context: {e}")
             return None
-        finally:
-            conn.close()
     
     async def update_user_context(
         self,
@@ -416,52 +526,20 @@ class DatabaseSessionService(BaseSessionService):
         interaction_stats: Optional[Dict[str, Any]] = None
     ) -> None:
         """Update user context and preferences."""
-        conn = psycopg2.connect(DATABASE_URL)
+        pool = await _get_pool()
         try:
-            with conn.cursor() as cur:
-                # Get current context
-                cur.execute("""
-                    SELECT user_preferences, interaction_stats
-                    FROM user_context 
-                    WHERE user_id = %s AND app_name = %s
-                """, (user_id, app_name))
-                
-                current = cur.fetchone()
-                
-                if current:
-                    current_prefs, current_stats = current
-                    
-                    new_prefs = {**(current_prefs or {}), **(preferences or {})}
-                    new_stats = {**(current_stats or {}), **(interaction_stats or {})}
-                    
-                    cur.execute("""
-                        UPDATE user_context 
-                        SET user_preferences = %s,
-                            interaction_stats = %s,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE user_id = %s AND app_name = %s
-                    """, (json.dumps(new_prefs), json.dumps(new_stats), user_id, app_name))
-                else:
-                    # Create new context
-                    cur.execute("""
-                        INSERT INTO user_context 
-                        (user_id, app_name, user_preferences, interaction_stats)
-                        VALUES (%s, %s, %s, %s)
-                    """, (
-                        user_id, 
-                        app_name, 
-                        json.dumps(preferences or {}), 
-                        json.dumps(interaction_stats or {})
-                    ))
-                
-                conn.commit()
-                
+            # One atomic UPSERT; JSONB || merges the new keys server-side, so
+            # there is no read-modify-write race between concurrent updates
+            await pool.execute(UPDATE_USER_CONTEXT_SQL,
+                user_id,
+                app_name,
+                preferences or {},
+                interaction_stats or {}
+            )
+            
         except Exception as e:
             print(f"Error updating user context: {e}")
-            conn.rollback()
             raise
-        finally:
-            conn.close()
     
     async def get_session_events(
         self,
@@ -469,39 +547,48 @@ class DatabaseSessionService(BaseSessionService):
         user_id: str,
         session_id: str,
         limit: int = 100,
-        offset: int = 0
+        before_timestamp: Optional[datetime] = None,
+        before_event_id: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Get detailed event history for a session."""
-        conn = psycopg2.connect(DATABASE_URL)
+        """
+        Get detailed event history for a session, newest first.
+
+        Pages are keyset-based: pass the last returned event's timestamp and
+        event_id as before_timestamp/before_event_id to fetch the next page.
+        """
+        if before_timestamp is None or before_event_id is None:
+            query, params = SESSION_EVENTS_SQL, (session_id, user_id, app_name, int(limit))
+        else:
+            query, params = SESSION_EVENTS_BEFORE_SQL, (
+                session_id, user_id, app_name, int(limit), before_timestamp, int(before_event_id)
+            )
+
+        pool = await _get_pool()
         try:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT event_type, event_data, timestamp
-                    FROM session_events 
-                    WHERE session_id = %s AND user_id = %s AND app_name = %s
-                    ORDER BY timestamp DESC
-                    LIMIT %s OFFSET %s
-                """, (session_id, user_id, app_name, limit, offset))
-                
+            # Server-side cursor: rows arrive EVENTS_CURSOR_PREFETCH at a time
+            # instead of the whole page being buffered by the driver first
+            async with pool.acquire() as conn, conn.transaction():
                 return [
                     {
-                        "type": row[0],
-                        "data": row[1],
-                        "timestamp": row[2]
+                        "event_id": row[0],
+                        "type": row[1],
+                        "data": row[2],
+                        "timestamp": row[3]
                     }
-                    for row in cur.fetchall()
+                    async for row in conn.cursor(query, *params, prefetch=EVENTS_CURSOR_PREFETCH)
                 ]
-                
+            
         except Exception as e:
             print(f"Error retrieving session events: {e}")
             return []
-        finally:
-            conn.close()
     
-    def close(self):
+    async def close(self):
         """Close database connections."""
-        # Connection pooling would go here if implemented
-        pass
+        global _pool
+        async with _pool_lock:
+            if _pool is not None:
+                await _pool.close()
+                _pool = None
 
 # Factory function for easy integration
 def create_database_session_service() -> DatabaseSessionService:
@@ -10,64 +10,106 @@ Usage:
 """
 
 import re
-from typing import List, Dict
+from functools import lru_cache
+from itertools import chain
+from typing import List, Dict, Optional, Tuple
+
+class PlayerTrie:
+    """
+    Lookup tables over lowercased player names, built once per database.
+
+    Exact full names and surnames are plain dict lookups (name -> database
+    indices). Every suffix of each name goes into a trie, so descending a
+    needle answers "is a substring of"; each trie node keeps a posting list
+    of database indices for keys ending there, so results come back in
+    database order.
+    """
+
+    def __init__(self, players: Tuple[str, ...]):
+        self.players = players
+        self.root: Dict = {}
+        self.full_names: Dict[str, List[int]] = {}
+        self.surnames: Dict[str, List[int]] = {}
+        for index, player in enumerate(players):
+            name = player.lower()
+            self.full_names.setdefault(name, []).append(index)
+            # Surname = text after the last space; a slice, no token list
+            self.surnames.setdefault(name[name.rfind(" ") + 1:], []).append(index)
+            for start in range(len(name)):
+                self._insert(name[start:], index)
+
+    def _insert(self, key: str, index: int) -> None:
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault("", []).append(index)
+
+    def find(self, needle: str) -> Optional[Dict]:
+        """Node reached by descending needle, or None if no name contains it."""
+        node = self.root
+        for char in needle:
+            node = node.get(char)
+            if node is None:
+                return None
+        return node
+
+    @staticmethod
+    def subtree_indices(node: Dict) -> List[int]:
+        """Sorted database indices of every key ending at or below node."""
+        indices = set()
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            indices.update(current.get("", ()))
+            stack.extend(child for char, child in current.items() if char)
+        return sorted(indices)
+
+@lru_cache(maxsize=8)
+def _player_trie(players: Tuple[str, ...]) -> PlayerTrie:
+    return PlayerTrie(players)
 
 def demo_find_players_by_name(search_name: str, mock_database: List[str], max_results: int = 5) -> List[Dict[str, str]]:
     """
     Demo version of find_players_by_name with mock database.
+
+    Player names are lowercased once, when the database's trie is built;
+    per call only the query itself is lowercased.
     """
-    search_name = search_name.strip().title()
-    matches = []
-    
-    # Strategy 1: Exact match
-    for player in mock_database:
-        if player.lower() == search_name.lower():
-            matches.append({"full_name": player, "match_type": "exact"})
-    
-    # Strategy 2: Surname match (if search name is likely a surname)
-    if len(search_name.split()) == 1:
-        for player in mock_database:
-            player_surname = player.split()[-1]  # Get last word
-            if player_surname.lower() == search_name.lower():
-                matches.append({"full_name": player, "match_type": "surname"})
-    
-    # Strategy 3: Partial name match
-    for player in mock_database:
-        if search_name.lower() in player.lower():
-            matches.append({"full_name": player, "match_type": "partial"})
-    
-    # Remove duplicates
-    unique_matches = []
-    seen_names = set()
-    for match in matches:
-        if match["full_name"] not in seen_names:
-            unique_matches.append(match)
-            seen_names.add(match["full_name"])
-            if len(unique_matches) >= max_results:
-                break
-    
-    return unique_matches
+    needle = search_name.strip().lower()
+    trie = _player_trie(tuple(mock_database))
+    node = trie.find(needle)
+    if node is None:
+        return []
+
+    # Exact and surname hits are dict lookups; anything at or below the trie
+    # node is a partial (substring) hit. Same precedence as before: exact,
+    # then surname (single-word queries only), then partial.
+    candidates = [(index, "exact") for index in trie.full_names.get(needle, ())]
+    if " " not in needle:
+        candidates += [(index, "surname") for index in trie.surnames.get(needle, ())]
+    partials = ((index, "partial") for index in PlayerTrie.subtree_indices(node))
+
+    # Dedup as we go: strategies arrive in priority order, so the first
+    # (highest-priority) match type recorded for a player wins
+    matches: Dict[str, str] = {}
+    for index, match_type in chain(candidates, partials):
+        matches.setdefault(trie.players[index], match_type)
+        if len(matches) >= max_results:
+            break
+    
+    return [{"full_name": name, "match_type": match_type} for name, match_type in matches.items()]
 
 def demo_expand_player_name(player_input: str, mock_database: List[str]) -> List[str]:
     """Demo version of expand_player_name."""
-    player_input = player_input.strip()
-    
-    # First try exact match
-    exact_matches = demo_find_players_by_name(player_input, mock_database, max_results=1)
-    if exact_matches and exact_matches[0]["match_type"] == "exact":
-        return [exact_matches[0]["full_name"]]
-    
-    # If no exact match, find all potential matches
-    all_matches = demo_find_players_by_name(player_input, mock_database, max_results=10)
-    
-    if not all_matches:
-        return []
+    # One lookup: results are ordered exact > surname > partial, so the first
+    # entry of the wide search is exactly what a max_results=1 probe returned
+    all_matches = demo_find_players_by_name(player_input.strip(), mock_database, max_results=10)
     
-    # If only one match, return it
-    if len(all_matches) == 1:
+    # An exact match wins outright
+    if all_matches and all_matches[0]["match_type"] == "exact":
         return [all_matches[0]["full_name"]]
     
-    # Multiple matches - return all of them
+    # Otherwise every potential match (possibly none, possibly just one)
     return [match["full_name"] for match in all_matches]
 
 def main():
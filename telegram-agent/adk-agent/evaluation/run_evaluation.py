@@ -1,18 +1,64 @@
 import asyncio
 import os
 import sys
-import json
+
+import orjson
 
 # Add the parent directory to the sys.path to allow for imports from the main module
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
-from agents import (
-    create_prediction_agent,
-    create_analysis_agent,
-    create_dispatcher_agent,
-)
+from agents import ROOT_AGENT
+
+# At most this many test cases are in flight at once; the LLM calls are
+# I/O-bound, so overlapping them cuts wall-clock time roughly by this factor
+EVAL_CONCURRENCY = int(os.getenv("EVAL_CONCURRENCY", "8"))
+EVAL_APP_NAME = "tennis_agent_eval"
+EVAL_USER_ID = "eval_user"
+
+async def run_test_case(runner, session_service, semaphore, idx, test_case):
+    """Run one test case in its own session and return its result."""
+    async with semaphore:
+        return await _run_test_case(runner, session_service, idx, test_case)
+
+async def _run_test_case(runner, session_service, idx, test_case):
+    user_message = test_case.get('input', '')
+    expected_output = test_case.get('expected_output', '')
+    session_id = f"eval_session_{idx}"
+    
+    try:
+        await session_service.create_session(
+            app_name=EVAL_APP_NAME,
+            user_id=EVAL_USER_ID,
+            session_id=session_id,
+        )
+        chunks = []
+        async for event in runner.run_async(
+            user_id=EVAL_USER_ID,
+            session_id=session_id,
+            new_message=user_message,
+        ):
+            text = getattr(event, "text", None) or getattr(event, "message", None)
+            if text:
+                chunks.append(text)
+        response_text = "".join(chunks)
+        
+        return {
+            "test_case": idx,
+            "input": user_message,
+            "expected": expected_output,
+            "actual": response_text.strip(),
+            "passed": bool(response_text.strip()),
+        }
+        
+    except Exception as e:
+        return {
+            "test_case": idx,
+            "input": user_message,
+            "error": str(e),
+            "passed": False,
+        }
 
 async def run_evaluation():
     """
@@ -27,26 +73,22 @@ async def run_evaluation():
         print(f"Evaluation set not found at {eval_set_path}")
         return
     
-    with open(eval_set_path, 'r') as f:
-        eval_data = json.load(f)
-    
-    # Create the agent
-    prediction_agent = create_prediction_agent()
-    analysis_agent = create_analysis_agent()
-    dispatcher_agent = create_dispatcher_agent(prediction_agent, analysis_agent)
+    # orjson parses the raw bytes directly, skipping the text decode
+    with open(eval_set_path, 'rb') as f:
+        eval_data = orjson.loads(f.read())
     
     # Create an in-memory session service for evaluation
     session_service = InMemorySessionService()
     
-    # Create the runner
+    # Create the runner once; every test case shares it (and one user id),
+    # each in its own session
     runner = Runner(
-        agent=dispatcher_agent,
-        app_name="tennis_agent_eval",
+        agent=ROOT_AGENT,
+        app_name=EVAL_APP_NAME,
         session_service=session_service,
     )
     
     # Run evaluation
-    results = []
     if isinstance(eval_data, dict) and 'test_cases' in eval_data:
         test_cases = eval_data['test_cases']
     elif isinstance(eval_data, list):
@@ -57,44 +99,23 @@ async def run_evaluation():
     
     print(f"\nRunning {len(test_cases)} test cases...\n")
     
-    for idx, test_case in enumerate(test_cases, 1):
-        user_id = f"eval_user_{idx}"
-        user_message = test_case.get('input', '')
-        expected_output = test_case.get('expected_output', '')
-        
-        print(f"Test {idx}: {user_message}")
-        
-        try:
-            response_text = ""
-            async for event in runner.run_async(
-                user_id=user_id,
-                session_id=None,
-                new_message=user_message,
-            ):
-                if hasattr(event, "text") and event.text:
-                    response_text += event.text
-                elif hasattr(event, "message") and event.message:
-                    response_text += event.message
-            
-            result = {
-                "test_case": idx,
-                "input": user_message,
-                "expected": expected_output,
-                "actual": response_text.strip(),
-                "passed": bool(response_text.strip()),
-            }
-            results.append(result)
-            print(f"  Response: {response_text[:100]}...")
+    # No batch barrier: a slow case only holds its own semaphore slot, and
+    # each result is reported as soon as it completes
+    semaphore = asyncio.Semaphore(EVAL_CONCURRENCY)
+    tasks = [
+        run_test_case(runner, session_service, semaphore, idx, test_case)
+        for idx, test_case in enumerate(test_cases, 1)
+    ]
+    results = [None] * len(test_cases)
+    for done, next_result in enumerate(asyncio.as_completed(tasks), 1):
+        result = await next_result
+        results[result["test_case"] - 1] = result
+        print(f"[{done}/{len(tasks)}] Test {result['test_case']}: {result['input']}")
+        if "error" in result:
+            print(f"  Error: {result['error']}\n")
+        else:
+            print(f"  Response: {result['actual'][:100]}...")
             print(f"  Status: {'PASSED' if result['passed'] else 'FAILED'}\n")
-            
-        except Exception as e:
-            print(f"  Error: {e}\n")
-            results.append({
-                "test_case": idx,
-                "input": user_message,
-                "error": str(e),
-                "passed": False,
-            })
     
     # Print summary
     print("\n--- Evaluation Summary ---")
@@ -9,6 +9,13 @@ Usage:
     import these as fallback tools when database tools fail
 """
 
+from functools import lru_cache
+
+# Fallback messages depend only on the player name, and an outage tends to hit
+# the same few (trending) players repeatedly, so each message is memoized
+FALLBACK_CACHE_SIZE = 256
+
+@lru_cache(maxsize=FALLBACK_CACHE_SIZE)
 def get_player_matchups_fallback(player_name: str) -> str:
     """
     Fallback version of get_player_matchups that works without database.
@@ -35,6 +42,7 @@ Once the database connection is restored, I'll be able to provide detailed match
 - Upcoming fixtures
 - Surface-specific performance"""
 
+@lru_cache(maxsize=FALLBACK_CACHE_SIZE)
 def analyze_player_performance_fallback(player_name: str) -> str:
     """
     Fallback version of analyze_player_performance that works without database.
@@ -57,6 +65,10 @@ Unfortunately, I'm having trouble accessing the performance analytics database r
 
 Once database connectivity is restored, I'll provide detailed performance analytics including win rates, form analysis, and statistical breakdowns for {player_name}."""
 
+def _extract_player_name(args, kwargs) -> str:
+    """Player name from a mock tool call: first positional arg, else player_name kwarg."""
+    return args[0] if args else kwargs.get('player_name', "Unknown Player")
+
 # Mock tools that can be used when database is unavailable
 def create_mock_player_analysis_tools():
     """
@@ -65,25 +77,11 @@ def create_mock_player_analysis_tools():
     
     def mock_get_player_matchups(*args, **kwargs):
         """Mock tool that returns helpful fallback message."""
-        # Extract player name from arguments
-        player_name = "Unknown Player"
-        if args:
-            player_name = args[0]
-        elif 'player_name' in kwargs:
-            player_name = kwargs['player_name']
-        
-        return get_player_matchups_fallback(player_name)
+        return get_player_matchups_fallback(_extract_player_name(args, kwargs))
     
     def mock_analyze_player_performance(*args, **kwargs):
         """Mock tool that returns helpful fallback message."""
-        # Extract player name from arguments
-        player_name = "Unknown Player"
-        if args:
-            player_name = args[0]
-        elif 'player_name' in kwargs:
-            player_name = kwargs['player_name']
-            
-        return analyze_player_performance_fallback(player_name)
+        return analyze_player_performance_fallback(_extract_player_name(args, kwargs))
     
     return mock_get_player_matchups, mock_analyze_player_performance
 
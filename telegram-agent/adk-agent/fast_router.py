@@ -0,0 +1,83 @@
+"""
+Deterministic fast path for the bot's unambiguous request shapes.
+
+The agent's routing rules ("X vs Y" -> analyze_matchup, "value bets" ->
+get_value_bets) are plain string patterns, so a compiled regex can pick the
+tool in microseconds instead of spending an LLM turn on it. Anything that
+doesn't match a pattern outright falls back to the agent.
+"""
+
+import re
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from tools_registry import TOOLS
+
+# The registry's async wrappers, called directly without going through the LLM
+_analyze_matchup = TOOLS["analyze_matchup"].func
+_get_value_bets = TOOLS["get_value_bets"].func
+_get_predictions = TOOLS["get_predictions"].func
+
+# Patterns must match the whole message so extra qualifiers ("value bets on
+# clay above 2.0") still go to the agent, which can map them onto filters.
+# Each side of a matchup is a short name (at most three words); _matchup also
+# rejects sides containing query words, so "Djokovic vs Nadal on clay" or
+# "who wins Djokovic vs Nadal?" go to the agent rather than the tool.
+_NAME = r"[\w.'-]+?(?:\s+[\w.'-]+?){0,2}"
+_MATCHUP = re.compile(
+    rf"^\s*(?:analy[sz]e\s+|analysis\s+of\s+)?(?P<player1>{_NAME})\s+(?:vs\.?|versus)\s+(?P<player2>{_NAME})\s*[?.!]*\s*$",
+    re.IGNORECASE,
+)
+_VALUE_BETS = re.compile(
+    r"^\s*(?:show\s+(?:me\s+)?|get\s+|any\s+)?(?:today'?s\s+)?value\s+bets?(?:\s+(?:for\s+)?today)?\s*[?.!]*\s*$",
+    re.IGNORECASE,
+)
+_TODAYS_PREDICTIONS = re.compile(
+    r"^\s*(?:show\s+(?:me\s+)?|get\s+)?(?:today'?s\s+)?predictions(?:\s+(?:for\s+)?today)?\s*[?.!]*\s*$",
+    re.IGNORECASE,
+)
+
+
+# Words that never occur in a player name; a matchup side containing one is a
+# qualified question, not a bare name
+_NOT_A_NAME = frozenset("""
+    a an the and or of on at in for about to me my show tell give
+    who what which how will would should can could do does is are
+    win wins winner won beat beats predict prediction predictions pick picks
+    tip tips bet bets value odds analysis analyze analyse stats form h2h head
+    match matchup today tomorrow tonight clay grass hard court indoor surface
+    final semifinal semi quarterfinal round set sets
+""".split())
+
+# Tool replies that are not answers (no such player, several candidates,
+# database trouble, errors); the agent can recover from these, so the raw
+# text is never sent straight to the user
+_DEFER_TO_AGENT = re.compile(
+    r"^(?:Error\b|Invalid LLM|I couldn't find any players|I found multiple players|I want to .* having trouble accessing)"
+)
+
+
+def _matchup(match: re.Match) -> Optional[Awaitable[str]]:
+    players = (match.group("player1").strip(), match.group("player2").strip())
+    if any(word in _NOT_A_NAME for player in players for word in player.lower().split()):
+        return None
+    return _analyze_matchup(*players)
+
+
+_ROUTE_PATTERNS: List[Tuple[re.Pattern, Callable[[re.Match], Optional[Awaitable[str]]]]] = [
+    (_MATCHUP, _matchup),
+    (_VALUE_BETS, lambda match: _get_value_bets()),
+    (_TODAYS_PREDICTIONS, lambda match: _get_predictions()),
+]
+
+
+async def try_fast_route(text: str) -> Optional[str]:
+    """Run the matching tool directly, or return None to defer to the agent."""
+    for pattern, handler in _ROUTE_PATTERNS:
+        match = pattern.match(text)
+        if match:
+            call = handler(match)
+            if call is None:
+                return None
+            result = await call
+            return None if _DEFER_TO_AGENT.match(result) else result
+    return None
@@ -1,21 +1,25 @@
 import os
 import asyncio
-from datetime import datetime
+import hmac
+from typing import List, Optional, Set, Tuple
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, Response
 from telegram import Update
 from telegram.ext import Application, MessageHandler, filters, ContextTypes
 import uvicorn
 
-from google.adk.agents import LlmAgent
+from google.adk.agents.context_cache_config import ContextCacheConfig
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.apps import App
+from google.adk.events import Event
 from google.adk.runners import Runner
 from google.genai.types import Content, Part
 
-from agents import (
-    create_prediction_agent,
-    create_analysis_agent,
-    create_dispatcher_agent,
-)
+from agents import ROOT_AGENT
+from database_mcp_server import clear_result_cache
+from fast_router import try_fast_route
+from semantic_cache import SemanticCache
+from tools import get_predictions, get_value_bets
 
 # Load environment variables
 load_dotenv()
@@ -26,32 +30,55 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 WEBHOOK_URL = os.getenv("WEBHOOK_URL")
 PORT = int(os.getenv("PORT", "3004"))
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Shared secret for the cache invalidation route; the route is disabled when unset
+CACHE_ADMIN_TOKEN = os.getenv("CACHE_ADMIN_TOKEN")
 
 if not all([TELEGRAM_BOT_TOKEN, GOOGLE_API_KEY, WEBHOOK_URL]):
     raise ValueError("TELEGRAM_BOT_TOKEN, GOOGLE_API_KEY, and WEBHOOK_URL must be set in the .env file")
 
 WEBHOOK_PATH = "/webhook"
+CACHE_INVALIDATION_PATH = "/admin/invalidate-cache"
 
 # --- ADK Agent and Runner Initialization ---
-# Create specialized agents
-prediction_agent = create_prediction_agent()
-analysis_agent = create_analysis_agent()
-
-# Create the dispatcher agent
-dispatcher_agent = create_dispatcher_agent(prediction_agent, analysis_agent)
-
 # Use InMemorySessionService for now to test basic functionality
 from google.adk.sessions import InMemorySessionService
 session_service = InMemorySessionService()
 print("Using InMemorySessionService for testing")
 
-# Create the Runner for executing the agent
+# Gemini context cache for the static system prompt and tool declarations.
+# The App is built once at startup, so ADK creates one CachedContent and reuses
+# it across turns instead of re-caching the prefix on every request.
+CONTEXT_CACHE_TTL = int(os.getenv("CONTEXT_CACHE_TTL", "86400"))
+adk_app = App(
+    name="agents",  # Must match the module where the agent is defined
+    root_agent=ROOT_AGENT,  # Single tennis_agent, no dispatcher hop
+    context_cache_config=ContextCacheConfig(
+        ttl_seconds=CONTEXT_CACHE_TTL,
+        cache_intervals=100,  # Invocations served by one cache before refresh
+        min_tokens=1024,  # Gemini's minimum cacheable prompt size
+    ),
+)
+
+# Create the Runner for executing the agent.
+# Routing is static: every turn goes straight to ROOT_AGENT, so there is no
+# per-chat routing decision to classify or cache (no sticky-route table needed).
 runner = Runner(
-    agent=dispatcher_agent,
-    app_name="agents",  # Must match the module where the agent is defined
+    app=adk_app,
     session_service=session_service,
 )
 
+# Stream partial text so the reply starts showing while the model is still decoding
+RUN_CONFIG = RunConfig(streaming_mode=StreamingMode.SSE)
+
+# Telegram rate-limits message edits per chat, so streamed text is coalesced:
+# flush after STREAM_FLUSH_INTERVAL seconds or STREAM_FLUSH_CHARS (~40 tokens)
+# of new text, whichever comes first.
+STREAM_FLUSH_INTERVAL = 0.4
+STREAM_FLUSH_CHARS = 160
+
+# Paraphrase-tolerant response cache in front of the agent
+semantic_cache = SemanticCache(api_key=GOOGLE_API_KEY)
+
 # --- Telegram Bot and FastAPI App Initialization ---
 application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
 app = FastAPI()
@@ -59,6 +86,119 @@ app = FastAPI()
 # Store runner for async access
 global_runner = runner
 
+# Set once application.initialize() has run in startup_event
+application_ready = asyncio.Event()
+
+def event_text(event: Event) -> str:
+    """Visible text carried by an event (the model's thought parts are skipped)."""
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(part.text for part in event.content.parts if part.text and not part.thought)
+
+class StreamingReply:
+    """A Telegram reply that is sent on the first flush and edited on later ones."""
+
+    def __init__(self, message):
+        self.message = message
+        self.reply = None
+        # Completed text plus the partial pieces streamed after it; the pieces
+        # are only joined when a flush actually sends them
+        self.committed_text = ""
+        self.pieces: List[str] = []
+        self.pending_chars = 0
+        self.sent_text = ""
+        self._timer: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def append(self, piece: str) -> None:
+        """Buffer a partial piece; flush now if enough is pending, else debounce."""
+        self.pieces.append(piece)
+        self.pending_chars += len(piece)
+        if self.pending_chars - len(self.sent_text) >= STREAM_FLUSH_CHARS:
+            self._cancel_timer()
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    def commit(self, text: str) -> None:
+        """Replace the buffered pieces with the full text of a completed event."""
+        self.committed_text = text
+        self.pieces.clear()
+        self.pending_chars = len(text)
+
+    async def finish(self, text: str) -> None:
+        """Flush the final text, sending a fresh reply if nothing was streamed."""
+        self._cancel_timer()
+        self.commit(text)
+        await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            text = (self.committed_text + "".join(self.pieces)).strip()
+            if not text or text == self.sent_text:
+                return
+            # Use plain text to avoid markdown parsing issues
+            if self.reply is None:
+                self.reply = await self.message.reply_text(text)
+            else:
+                self.reply = await self.reply.edit_text(text)
+            self.sent_text = text
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(STREAM_FLUSH_INTERVAL)
+        # Clear first so finish() never cancels an edit that is already in flight
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"Streaming edit failed: {e}")
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+# (user_id, session_id) pairs known to exist in session_service. Returning
+# chats are the common case, and the Runner only needs the ids, so once a
+# session has been seen its turns skip the lookup entirely.
+_known_sessions: Set[Tuple[str, str]] = set()
+
+async def get_or_create_session(user_id: str, session_id: str):
+    """Fetch the chat's session, creating it on first contact."""
+    session = await session_service.get_session(
+        app_name="agents",
+        user_id=user_id,
+        session_id=session_id
+    )
+    if not session:
+        session = await session_service.create_session(
+            app_name="agents",
+            user_id=user_id,
+            session_id=session_id
+        )
+    _known_sessions.add((user_id, session_id))
+    return session
+
+async def ensure_session(user_id: str, session_id: str) -> None:
+    """Make sure the session exists, without a lookup once it is known to."""
+    if (user_id, session_id) not in _known_sessions:
+        await get_or_create_session(user_id, session_id)
+
+async def record_turn(user_id: str, session_id: str, message: Content, response_text: str) -> None:
+    """Append a turn answered outside the Runner so follow-ups still see it."""
+    # append_event needs the live Session object, so fetch it only on this path
+    session = await get_or_create_session(user_id, session_id)
+    # Always a fresh Event: append_event keeps the instance in session.events
+    # (and hands it to the Runner later), so events cannot be pooled/reused
+    await session_service.append_event(session, Event(author="user", content=message))
+    await session_service.append_event(
+        session,
+        Event(
+            author=ROOT_AGENT.name,
+            content=Content(role="model", parts=[Part(text=response_text)]),
+        ),
+    )
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle incoming Telegram messages with persistent conversational context."""
     user_id = str(update.effective_user.id)
@@ -70,69 +210,76 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     print(f"[{user_id}] User: {user_message_text}")
 
     try:
-        session_id = user_id  # Use user ID as session ID
-        
-        # Get current session with conversation history
-        session_data = await session_service.get_session(
-            app_name="agents",
-            user_id=user_id,
-            session_id=session_id
-        )
+        # One persistent session per Telegram chat: the Runner appends every turn
+        # to it, so each request extends the same history (and the same cached
+        # prompt prefix) instead of starting from scratch.
+        session_id = str(update.effective_chat.id)
         
-        # Initialize conversation history if session is new
-        conversation_history = []
-        if session_data:
-            conversation_history = session_data.events or []
-        else:
-            # Create new session if it doesn't exist
-            await session_service.create_session(
-                app_name="agents",
-                user_id=user_id,
-                session_id=session_id
-            )
+        await ensure_session(user_id, session_id)
         
         # Create the new message
-        message = Content(parts=[Part(text=user_message_text)])
+        message = Content(role="user", parts=[Part(text=user_message_text)])
         
-        # Run the agent using the Runner
+        # Follow-ups like "the first one" need the chat history, so only
+        # self-contained queries may skip the agent
+        context_free = semantic_cache.is_cacheable_query(user_message_text)
+        
+        # Deterministic requests ("X vs Y", "value bets") go straight to the tool
+        routed_response = await try_fast_route(user_message_text) if context_free else None
+        if routed_response:
+            await record_turn(user_id, session_id, message, routed_response)
+            print(f"[{user_id}] Agent (fast route): {routed_response}")
+            await update.message.reply_text(routed_response)
+            return
+        
+        # Serve paraphrases of recent questions from the semantic cache; a hit
+        # must also name exactly the same entities (players, numbers, dates,
+        # surfaces, tours) as the cached question
+        query_embedding = None
+        query_entities = semantic_cache.entity_terms(user_message_text)
+        if context_free:
+            query_embedding = await semantic_cache.embed(user_message_text)
+        cached_response = semantic_cache.lookup(query_embedding, query_entities) if query_embedding else None
+        if cached_response:
+            await record_turn(user_id, session_id, message, cached_response)
+            print(f"[{user_id}] Agent (cached): {cached_response}")
+            await update.message.reply_text(cached_response)
+            return
+        
+        # Run the agent using the Runner, streaming partial text into one
+        # Telegram message that is edited as more of the reply arrives
+        response_chunks: List[str] = []
         response_text = ""
+        reply = StreamingReply(update.message)
+        prompt_tokens = cached_tokens = 0
         async for event in global_runner.run_async(
             user_id=user_id,
             session_id=session_id,
             new_message=message,
+            run_config=RUN_CONFIG,
         ):
-            # Collect text from events
-            if hasattr(event, "text") and event.text:
-                response_text += event.text
-            # Also check for content parts which may contain text
-            if hasattr(event, "content") and event.content:
-                for part in event.content.parts:
-                    if hasattr(part, "text") and part.text:
-                        response_text += part.text
+            if event.partial:
+                await reply.append(event_text(event))
+                continue
+            
+            # Complete (non-partial) events repeat the streamed text in full;
+            # they are few, so the joined prefix is rebuilt only here
+            response_chunks.append(event_text(event))
+            response_text = "".join(response_chunks)
+            reply.commit(response_text)
+            # Track how much of each prompt was served from the context cache
+            usage = event.usage_metadata
+            if usage:
+                prompt_tokens += usage.prompt_token_count or 0
+                cached_tokens += usage.cached_content_token_count or 0
 
         final_response = response_text.strip() or "I couldn't generate a response."
+        if query_embedding and response_text.strip():
+            semantic_cache.store(query_embedding, query_entities, final_response)
         
-        # Update session with the complete conversation turn
-        new_events = conversation_history + [
-            {
-                "type": "user_message",
-                "content": user_message_text,
-                "timestamp": datetime.now().isoformat()
-            },
-            {
-                "type": "agent_response", 
-                "content": final_response,
-                "timestamp": datetime.now().isoformat()
-            }
-        ]
-        
-        # TEMPORARY: Skip event logging to get bot working
-        # TODO: Implement proper event persistence
-        print("Skipping event logging for now - bot operational")
-        
+        print(f"[{user_id}] Prompt tokens: {prompt_tokens} (cached: {cached_tokens})")
         print(f"[{user_id}] Agent: {final_response}")
-        # Use plain text to avoid markdown parsing issues
-        await update.message.reply_text(final_response)
+        await reply.finish(final_response)
 
     except Exception as e:
         print(f"Error processing message: {e}")
@@ -143,15 +290,30 @@ async def telegram_webhook(request: Request):
     """Handle Telegram webhook updates."""
     update_data = await request.json()
     
-    # Initialize the application if not already done
-    if not hasattr(application, '_initialized') or not application._initialized:
-        await application.initialize()
-        application._initialized = True
+    # Updates that arrive before startup has finished wait for initialize()
+    if not application_ready.is_set():
+        await application_ready.wait()
     
     update = Update.de_json(update_data, application.bot)
     await application.process_update(update)
     return Response(status_code=200)
 
+@app.post(CACHE_INVALIDATION_PATH)
+async def invalidate_cache(request: Request):
+    """Drop cached replies and tool results once new match data has been loaded."""
+    token = request.headers.get("X-Admin-Token", "")
+    if not CACHE_ADMIN_TOKEN or not hmac.compare_digest(token.encode(), CACHE_ADMIN_TOKEN.encode()):
+        return Response(status_code=403)
+    
+    # The fast router calls the cached tools directly, so every layer goes,
+    # MCP tool results included
+    semantic_cache.clear()
+    get_predictions.cache_clear()
+    get_value_bets.cache_clear()
+    clear_result_cache()
+    print("Caches invalidated (semantic cache, get_predictions, get_value_bets, MCP results)")
+    return {"status": "cleared"}
+
 @app.get("/health")
 def health_check():
     """Health check endpoint."""
@@ -161,6 +323,8 @@ def health_check():
 async def startup_event():
     """Set Telegram webhook on startup."""
     print("Starting Tennis Prediction Agent...")
+    await application.initialize()
+    application_ready.set()
     print("Setting webhook...")
     await application.bot.set_webhook(url=f"{WEBHOOK_URL}{WEBHOOK_PATH}")
     print(f"Webhook set to {WEBHOOK_URL}{WEBHOOK_PATH}")
@@ -173,10 +337,14 @@ async def shutdown_event():
     await application.bot.delete_webhook()
     print("Webhook deleted.")
 
+async def serve():
+    """Register the bot's handlers and serve the webhook on the running event loop."""
+    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
+    await uvicorn.Server(uvicorn.Config(app, host="0.0.0.0", port=PORT)).serve()
+
 def main():
     """Start the application."""
-    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
-    uvicorn.run(app, host="0.0.0.0", port=PORT)
+    asyncio.run(serve())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,59 @@
+"""
+Helpers shared by the startup and test scripts.
+"""
+
+import os
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+# Environment every agent script needs, from the process or from .env
+REQUIRED_ENV_VARS = frozenset({"DATABASE_URL", "GOOGLE_API_KEY", "TELEGRAM_BOT_TOKEN"})
+
+
+@lru_cache(maxsize=1)
+def load_env() -> Dict[str, str]:
+    """Parse .env once and return the required variables that are set."""
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), ".env"))
+    return {var: os.environ[var] for var in REQUIRED_ENV_VARS if var in os.environ}
+
+
+def missing_files(required: Iterable[str], directory: str = ".") -> List[str]:
+    """Sorted names from required that are not present in directory."""
+    # One directory listing instead of a stat per required file
+    return sorted(set(required).difference(entry.name for entry in os.scandir(directory)))
+
+
+def install_uvloop() -> None:
+    """Run the script's event loop on uvloop when it is installed."""
+    # uvloop cuts per-await overhead for the asyncpg and Runner event loops;
+    # the stock asyncio loop is used otherwise
+    try:
+        import uvloop
+    except ImportError:
+        return
+    uvloop.install()
+
+
+async def conversation_count(app_name: str, user_id: str, session_id: str) -> int:
+    """A test session's conversation_count, read straight from agent_sessions (0 if missing)."""
+    # get_session() returns only ADK's id fields, so tests check the counter here
+    from database_session_service import _get_pool
+
+    pool = await _get_pool()
+    count = await pool.fetchval(
+        "SELECT conversation_count FROM agent_sessions"
+        " WHERE session_id = $1 AND user_id = $2 AND app_name = $3",
+        session_id, user_id, app_name,
+    )
+    return count or 0
+
+
+async def close_shared_pool() -> None:
+    """Close the session service's pool once, after every test has used it."""
+    # Only if a test imported the service (and so may have opened the pool)
+    module = sys.modules.get("database_session_service")
+    if module is not None:
+        await module.create_database_session_service().close()
@@ -0,0 +1,144 @@
+"""
+Semantic response cache for the Telegram agent.
+
+Users ask for the same thing in many phrasings ("Cirpanli analysis",
+"show me Cirpanli", "cirpanli predictions"), so an exact-match cache misses
+most repeats. Queries are embedded with text-embedding-004 and a cached reply
+is reused when a stored query is similar enough (cosine >= threshold) and the
+entry is still within its TTL.
+
+Similarity alone is not enough: queries built from the same template
+("cirpanli predictions" / "djokovic predictions", "value bets on clay" /
+"value bets on grass") embed close together, so every entry is also keyed by
+the entity terms of its query (player names, numbers, dates, surfaces, tours)
+and only entries with exactly the same entities are compared. Everything else
+about the wording is left to the embedding.
+"""
+
+import math
+import os
+import re
+import time
+from typing import FrozenSet, List, Optional, Tuple
+
+from google import genai
+
+EMBEDDING_MODEL = "text-embedding-004"
+SIMILARITY_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+SEMANTIC_CACHE_TTL = int(os.getenv("SEMANTIC_CACHE_TTL", "300"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "500"))
+
+# Follow-ups like "analyze all 3" or "the first one" depend on the chat history,
+# so their answers must never be shared between conversations.
+_CONTEXT_DEPENDENT = re.compile(
+    r"\b(it|that|this|those|these|them|first|second|third|last|previous|above|all \d+|same)\b",
+    re.IGNORECASE,
+)
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9'.-]*")
+
+# Query vocabulary that never names an entity. Every other token is an
+# entity term: player names, numbers and dates, and filters such as today,
+# tomorrow, clay, grass, atp or wta are deliberately not listed. An unlisted
+# generic word only costs cache hits; it can never make queries about
+# different entities match.
+_QUERY_WORDS = frozenset("""
+    a an the and or of for on in at to by with about from vs versus
+    i me my you your we us our show get give tell find list see check need want
+    what what's whats who who's how is are was will would can could should
+    please pls any some there do does did hey hi hello thanks thank
+    prediction predictions predict analysis analyses analyse analyze
+    matchup matchups match matches game games play playing
+    stats statistics form performance record history head-to-head h2h
+    odds value bet bets pick picks tip tips win wins winner chance chances
+    best top player players tournament tournaments
+""".split())
+
+
+def _entity_terms(text: str) -> FrozenSet[str]:
+    """Lowercased tokens of a query that are not query vocabulary."""
+    tokens = (token.rstrip(".").removesuffix("'s") for token in _TOKEN.findall(text.lower()))
+    return frozenset(token for token in tokens if token and token not in _QUERY_WORDS)
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class SemanticCache:
+    """In-memory (embedding, response) store searched by cosine similarity."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        threshold: float = SIMILARITY_THRESHOLD,
+        ttl: int = SEMANTIC_CACHE_TTL,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+    ):
+        self.client = genai.Client(api_key=api_key)
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # (expires_at, entity terms, unit-length embedding, response)
+        self._entries: List[Tuple[float, FrozenSet[str], List[float], str]] = []
+
+    @staticmethod
+    def is_cacheable_query(text: str) -> bool:
+        """Skip queries whose answer depends on earlier turns."""
+        return not _CONTEXT_DEPENDENT.search(text)
+
+    @staticmethod
+    def entity_terms(text: str) -> FrozenSet[str]:
+        """Entities a query is about; part of the cache key next to its embedding."""
+        return _entity_terms(text)
+
+    async def embed(self, text: str) -> Optional[List[float]]:
+        """Embed a query; returns None on failure so the caller falls through to the agent."""
+        try:
+            response = await self.client.aio.models.embed_content(
+                model=EMBEDDING_MODEL,
+                contents=text.strip().lower(),
+            )
+            return _normalize(response.embeddings[0].values)
+        except Exception as e:
+            print(f"Semantic cache embedding failed: {e}")
+            return None
+
+    def _best_match(self, embedding: List[float], entities: FrozenSet[str]) -> Tuple[int, float]:
+        """Index and similarity of the closest live entry with the same entities (-1 if none)."""
+        now = time.monotonic()
+        self._entries = [entry for entry in self._entries if entry[0] > now]
+
+        best_index, best_score = -1, 0.0
+        for index, (_, cached_entities, cached_embedding, _) in enumerate(self._entries):
+            if cached_entities != entities:
+                continue
+            # Both vectors are unit length, so the dot product is the cosine
+            score = sum(a * b for a, b in zip(embedding, cached_embedding))
+            if score > best_score:
+                best_index, best_score = index, score
+        return best_index, best_score
+
+    def lookup(self, embedding: List[float], entities: FrozenSet[str]) -> Optional[str]:
+        """Return the best cached response with the same entities at or above the threshold, if any."""
+        index, score = self._best_match(embedding, entities)
+        if index >= 0 and score >= self.threshold:
+            print(f"Semantic cache hit (similarity {score:.3f})")
+            return self._entries[index][3]
+        return None
+
+    def store(self, embedding: List[float], entities: FrozenSet[str], response: str) -> None:
+        """Upsert a response; the oldest entry is evicted when full."""
+        # A repeat of a cached question replaces that entry instead of adding a
+        # duplicate, and moves to the back as the newest entry
+        index, score = self._best_match(embedding, entities)
+        if index >= 0 and score >= self.threshold:
+            del self._entries[index]
+        self._entries.append((time.monotonic() + self.ttl, entities, embedding, response))
+        if len(self._entries) > self.max_entries:
+            self._entries.pop(0)
+
+    def clear(self) -> None:
+        """Bust the cache, e.g. after new predictions or results are loaded."""
+        self._entries.clear()
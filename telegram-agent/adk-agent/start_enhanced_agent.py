@@ -16,13 +16,28 @@ Usage:
 """
 
 import asyncio
-import multiprocessing
 import os
 import signal
-import subprocess
 import sys
-import time
-from datetime import datetime
+
+from console_log import log
+from script_helpers import REQUIRED_ENV_VARS, missing_files
+
+# Files the full agent (MCP server + webhook app) needs next to this script
+REQUIRED_FILES = frozenset({
+    'main.py',
+    'agents.py',
+    'prompts.py',
+    'tools.py',
+    'tools_registry.py',
+    'fast_router.py',
+    'semantic_cache.py',
+    'caching.py',
+    'console_log.py',
+    'script_helpers.py',
+    'database_mcp_server.py',
+    'database_session_service.py',
+})
 
 def print_banner():
     """Print startup banner."""
@@ -47,72 +62,33 @@ def print_banner():
 """
     print(banner)
 
-def start_database_mcp_server():
-    """Start the database MCP server in a separate process."""
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] Starting Database MCP Server on port 3005...")
+async def start_database_mcp_server():
+    """Run the database MCP server on the shared event loop."""
+    log("Starting Database MCP Server on port 3005...")
     
-    try:
-        # Import required modules
-        sys.path.insert(0, os.path.dirname(__file__))
-        
-        # Start the database MCP server
-        from database_mcp_server import main
-        asyncio.run(main())
-        
-    except KeyboardInterrupt:
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] Database MCP Server stopped by user")
-    except Exception as e:
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] Error starting Database MCP Server: {e}")
-        return False
-    return True
+    from database_mcp_server import main
+    await main()
+    log("Database MCP Server stopped")
 
-def start_main_agent():
-    """Start the main ADK agent."""
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] Starting Main ADK Agent on port 3004...")
+async def start_main_agent():
+    """Run the main ADK agent's webhook server on the shared event loop."""
+    log("Starting Main ADK Agent on port 3004...")
     
-    try:
-        # Import required modules
-        sys.path.insert(0, os.path.dirname(__file__))
-        
-        # Import and run the main agent
-        import main
-        main.main()
-        
-    except KeyboardInterrupt:
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] Main Agent stopped by user")
-    except Exception as e:
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] Error starting Main Agent: {e}")
-        return False
-    return True
+    import main
+    await main.serve()
+    log("Main Agent stopped")
 
 def check_dependencies():
     """Check if all required dependencies are available."""
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] Checking dependencies...")
+    log("Checking dependencies...")
     
-    required_files = [
-        'main.py',
-        'agents.py', 
-        'tools.py',
-        'database_mcp_server.py',
-        'database_session_service.py'
-    ]
-    
-    missing_files = []
-    for file in required_files:
-        if not os.path.exists(file):
-            missing_files.append(file)
-    
-    if missing_files:
-        print(f"❌ Missing required files: {', '.join(missing_files)}")
+    missing = missing_files(REQUIRED_FILES)
+    if missing:
+        print(f"❌ Missing required files: {', '.join(missing)}")
         return False
     
-    # Check environment variables
-    required_env_vars = ['DATABASE_URL', 'GOOGLE_API_KEY', 'TELEGRAM_BOT_TOKEN']
-    missing_env_vars = []
-    
-    for var in required_env_vars:
-        if not os.getenv(var):
-            missing_env_vars.append(var)
+    # Check environment variables (set but empty counts as missing)
+    missing_env_vars = sorted(var for var in REQUIRED_ENV_VARS if not os.environ.get(var))
     
     if missing_env_vars:
         print(f"❌ Missing environment variables: {', '.join(missing_env_vars)}")
@@ -121,28 +97,19 @@ def check_dependencies():
     print("✅ All dependencies satisfied")
     return True
 
-def test_database_connection():
+async def test_database_connection():
     """Test database connection."""
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] Testing database connection...")
+    log("Testing database connection...")
     
     try:
-        import psycopg2
-        from dotenv import load_dotenv
+        # Probe through the MCP server's shared asyncpg pool: the connection
+        # opened here is the one the server's tools go on to use
+        from database_mcp_server import get_pool
         
-        load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
-        database_url = os.getenv("DATABASE_URL")
+        pool = await get_pool()
+        await pool.fetchval("SELECT 1")
         
-        conn = psycopg2.connect(database_url)
-        cur = conn.cursor()
-        
-        # Test basic query
-        cur.execute("SELECT COUNT(*) FROM predictions LIMIT 1")
-        result = cur.fetchone()
-        
-        cur.close()
-        conn.close()
-        
-        print(f"✅ Database connection successful (found {result[0]} predictions)")
+        print("✅ Database connection successful")
         return True
         
     except Exception as e:
@@ -159,32 +126,26 @@ async def run_enhanced_agent():
         return False
     
     # Test database connection
-    if not test_database_connection():
+    if not await test_database_connection():
         print("❌ Database connection failed. Please check your DATABASE_URL.")
         return False
     
-    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 🚀 Starting Enhanced Tennis Prediction Agent...")
+    log("\n🚀 Starting Enhanced Tennis Prediction Agent...")
     
     try:
-        # Start Database MCP Server in a separate task
-        mcp_task = asyncio.create_task(start_database_mcp_server())
-        
-        # Wait a moment for MCP server to start
-        await asyncio.sleep(2)
-        
-        # Start Main Agent in the current task
-        main_task = asyncio.create_task(start_main_agent())
-        
-        # Wait for both tasks
-        await asyncio.gather(mcp_task, main_task, return_exceptions=True)
+        # Both servers share this event loop; the TaskGroup cancels the other
+        # one and re-raises if either fails
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(start_database_mcp_server())
+            tg.create_task(start_main_agent())
         
     except KeyboardInterrupt:
-        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 🛑 Shutting down Enhanced Agent...")
+        log("\n🛑 Shutting down Enhanced Agent...")
     except Exception as e:
-        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] ❌ Error running enhanced agent: {e}")
+        log(f"\n❌ Error running enhanced agent: {e}")
         return False
     
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] 👋 Enhanced Agent stopped")
+    log("👋 Enhanced Agent stopped")
     return True
 
 def main():
@@ -192,7 +153,7 @@ def main():
     try:
         # Set up signal handlers for graceful shutdown
         def signal_handler(sig, frame):
-            print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Received shutdown signal...")
+            log("\nReceived shutdown signal...")
             sys.exit(0)
         
         signal.signal(signal.SIGINT, signal_handler)
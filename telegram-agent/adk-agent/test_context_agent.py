@@ -12,7 +12,25 @@ Usage:
 import asyncio
 import os
 import sys
-from datetime import datetime
+
+from console_log import log
+from script_helpers import REQUIRED_ENV_VARS, install_uvloop, load_env, missing_files
+
+# Files the webhook app needs next to this script (no MCP server here)
+REQUIRED_FILES = frozenset({
+    'main.py',
+    'agents.py',
+    'prompts.py',
+    'tools.py',
+    'tools_registry.py',
+    'fast_router.py',
+    'semantic_cache.py',
+    'caching.py',
+    'console_log.py',
+    'script_helpers.py',
+    'database_session_service.py',
+})
+
 
 def print_banner():
     """Print startup banner."""
@@ -37,31 +55,16 @@ Start your Telegram conversation to test context preservation!
 
 def check_dependencies():
     """Check if all required dependencies are available."""
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] Checking dependencies...")
-    
-    required_files = [
-        'main.py',
-        'agents.py', 
-        'tools.py',
-        'database_session_service.py'
-    ]
-    
-    missing_files = []
-    for file in required_files:
-        if not os.path.exists(file):
-            missing_files.append(file)
+    log("Checking dependencies...")
     
-    if missing_files:
-        print(f"❌ Missing required files: {', '.join(missing_files)}")
+    missing = missing_files(REQUIRED_FILES)
+    if missing:
+        print(f"❌ Missing required files: {', '.join(missing)}")
         return False
     
-    # Check environment variables
-    required_env_vars = ['DATABASE_URL', 'GOOGLE_API_KEY', 'TELEGRAM_BOT_TOKEN']
-    missing_env_vars = []
-    
-    for var in required_env_vars:
-        if not os.getenv(var):
-            missing_env_vars.append(var)
+    # Check environment variables, .env included (set but empty counts as missing)
+    env = load_env()
+    missing_env_vars = sorted(var for var in REQUIRED_ENV_VARS if not env.get(var))
     
     if missing_env_vars:
         print(f"❌ Missing environment variables: {', '.join(missing_env_vars)}")
@@ -70,28 +73,24 @@ def check_dependencies():
     print("✅ All dependencies satisfied")
     return True
 
-def test_database_connection():
+async def test_database_connection():
     """Test database connection."""
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] Testing database connection...")
+    log("Testing database connection...")
     
     try:
-        import psycopg2
-        from dotenv import load_dotenv
-        
-        load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
-        database_url = os.getenv("DATABASE_URL")
+        import asyncpg
         
-        conn = psycopg2.connect(database_url)
-        cur = conn.cursor()
+        database_url = load_env()["DATABASE_URL"]
         
-        # Test basic query
-        cur.execute("SELECT COUNT(*) FROM predictions LIMIT 1")
-        result = cur.fetchone()
+        # asyncpg awaits the connect and query instead of blocking the loop
+        conn = await asyncpg.connect(database_url)
+        try:
+            # Test basic query
+            count = await conn.fetchval("SELECT COUNT(*) FROM predictions")
+        finally:
+            await conn.close()
         
-        cur.close()
-        conn.close()
-        
-        print(f"✅ Database connection successful (found {result[0]} predictions)")
+        print(f"✅ Database connection successful (found {count} predictions)")
         return True
         
     except Exception as e:
@@ -108,25 +107,26 @@ async def run_context_test_agent():
         return False
     
     # Test database connection
-    if not test_database_connection():
+    if not await test_database_connection():
         print("❌ Database connection failed. Please check your DATABASE_URL.")
         return False
     
-    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 🚀 Starting Context Test Agent...")
+    log("\n🚀 Starting Context Test Agent...")
     print("💡 Remember to test with: 'value bets' → 'analyze all 3'")
     
     try:
-        # Import and run the main agent
+        # Import and run the main agent on this event loop (main.main() would
+        # start a second one with asyncio.run)
         import main
-        main.main()
+        await main.serve()
         
     except KeyboardInterrupt:
-        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 🛑 Context Test Agent stopped by user")
+        log("\n🛑 Context Test Agent stopped by user")
     except Exception as e:
-        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] ❌ Error running context test agent: {e}")
+        log(f"\n❌ Error running context test agent: {e}")
         return False
     
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] 👋 Context Test Agent stopped")
+    log("👋 Context Test Agent stopped")
     return True
 
 def main():
@@ -134,13 +134,15 @@ def main():
     try:
         # Set up signal handlers for graceful shutdown
         def signal_handler(sig, frame):
-            print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Received shutdown signal...")
+            log("\nReceived shutdown signal...")
             sys.exit(0)
         
         import signal
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
         
+        install_uvloop()
+        
         # Run the context test agent
         asyncio.run(run_context_test_agent())
         
@@ -8,6 +8,8 @@ This verifies that the new agents.py will route correctly.
 import os
 import sys
 
+from check_bot_version import read_agent_sources
+
 def test_emergency_fix():
     """Test that the emergency fix is in place."""
     print("🧪 Testing Emergency Fix")
@@ -17,16 +19,15 @@ def test_emergency_fix():
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
     
     # Check if backup was created
-    if os.path.exists('agents_backup.py'):
-        print("✅ Backup created: agents_backup.py")
+    if os.path.exists(os.path.join('_archive', 'agents_backup.py')):
+        print("✅ Backup created: _archive/agents_backup.py")
     else:
         print("❌ Backup not found")
     
     # Check if new file is in place
-    with open('agents.py', 'r') as f:
-        content = f.read()
+    content = read_agent_sources()
     
-    if "🚨 SINGLE PLAYER REQUESTS → prediction_agent" in content:
+    if "- One player (e.g." in content:
         print("✅ Emergency fix routing rules found")
     else:
         print("❌ Emergency fix routing rules missing")
@@ -36,7 +37,7 @@ def test_emergency_fix():
     else:
         print("❌ Cirpanli example missing")
     
-    if "Route ALL single-player requests to prediction_agent immediately" in content:
+    if "never answer it yourself or ask for an opponent" in content:
         print("✅ Explicit routing instruction found")
     else:
         print("❌ Explicit routing instruction missing")
@@ -64,7 +65,7 @@ def test_emergency_fix():
     
     print("\n" + "="*40)
     print("🎉 EMERGENCY FIX READY!")
-    print("✅ Backup created: agents_backup.py")
+    print("✅ Backup created: _archive/agents_backup.py")
     print("✅ Enhanced routing in place")
     print("✅ Bot should now route correctly")
     
@@ -17,11 +17,13 @@ from datetime import datetime
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
 
-def print_test_header(test_name: str):
+from script_helpers import REQUIRED_ENV_VARS, close_shared_pool, conversation_count, install_uvloop, load_env
+
+def print_test_header(test_name: str, started: datetime):
     """Print test header."""
     print(f"\n{'='*60}")
     print(f"🧪 TEST: {test_name}")
-    print(f"⏰ {datetime.now().strftime('%H:%M:%S')}")
+    print(f"⏰ {started.strftime('%H:%M:%S')}")
     print('='*60)
 
 def print_test_result(test_name: str, success: bool, message: str = ""):
@@ -31,44 +33,40 @@ def print_test_result(test_name: str, success: bool, message: str = ""):
     if message:
         print(f"   📝 {message}")
 
+def report_test(test_name: str, started: datetime, outcome) -> bool:
+    """Print a test's header and its (success, message) outcome or exception; returns success."""
+    print_test_header(test_name, started)
+    if isinstance(outcome, BaseException):
+        print(f"\n❌ CRITICAL ERROR in {test_name}: {outcome}")
+        return False
+    success, message = outcome
+    print_test_result(test_name, success, message)
+    return success
+
 async def test_database_connection():
     """Test database connection."""
-    test_name = "Database Connection"
-    print_test_header(test_name)
-    
     try:
-        import psycopg2
-        from dotenv import load_dotenv
-        
-        load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
-        database_url = os.getenv("DATABASE_URL")
+        database_url = load_env().get("DATABASE_URL")
         
         if not database_url:
-            print_test_result(test_name, False, "DATABASE_URL not found in environment")
-            return False
-        
-        conn = psycopg2.connect(database_url)
-        cur = conn.cursor()
+            return False, "DATABASE_URL not found in environment"
         
-        # Test basic query
-        cur.execute("SELECT COUNT(*) FROM predictions LIMIT 1")
-        result = cur.fetchone()
+        # Borrow from the session service's pool, which the session tests
+        # below reuse, rather than opening a connection of its own
+        from database_session_service import _get_pool
         
-        cur.close()
-        conn.close()
+        pool = await _get_pool()
+        async with pool.acquire() as conn:
+            # Test basic query
+            count = await conn.fetchval("SELECT COUNT(*) FROM predictions")
         
-        print_test_result(test_name, True, f"Connected successfully, found {result[0]} predictions")
-        return True
+        return True, f"Connected successfully, found {count} predictions"
         
     except Exception as e:
-        print_test_result(test_name, False, f"Connection failed: {e}")
-        return False
+        return False, f"Connection failed: {e}"
 
 async def test_database_session_service():
     """Test database session service initialization."""
-    test_name = "Database Session Service"
-    print_test_header(test_name)
-    
     try:
         from database_session_service import create_database_session_service
         
@@ -86,48 +84,53 @@ async def test_database_session_service():
             initial_state={"test": "data"},
             metadata={"test_metadata": "value"}
         )
-        
-        # Test session retrieval
-        session_data = await session_service.get_session(
-            app_name=test_app_name,
-            user_id=test_user_id,
-            session_id=test_session_id
-        )
-        
-        if session_data and session_data.get("state", {}).get("test") == "data":
-            print_test_result(test_name, True, "Session creation and retrieval successful")
-            
-            # Clean up test session
-            await session_service.delete_session(
+    except Exception as e:
+        return False, f"Session service test failed: {e}"
+    
+    try:
+        # get_session() returns only ADK's id fields, so it shows the row
+        # exists; the stored counter is read from agent_sessions directly
+        session_data, turn_count = await asyncio.gather(
+            session_service.get_session(
                 app_name=test_app_name,
                 user_id=test_user_id,
                 session_id=test_session_id
-            )
-            
-            return True
+            ),
+            conversation_count(
+                app_name=test_app_name,
+                user_id=test_user_id,
+                session_id=test_session_id
+            ),
+        )
+        
+        if session_data and session_data.get("id") == test_session_id and turn_count == 0:
+            return True, "Session creation and retrieval successful"
         else:
-            print_test_result(test_name, False, "Session data mismatch")
-            return False
+            return False, "Session data mismatch"
             
     except Exception as e:
-        print_test_result(test_name, False, f"Session service test failed: {e}")
-        return False
+        return False, f"Session service test failed: {e}"
+    
+    finally:
+        # Clean up whether or not the test passed, so reruns start empty
+        await session_service.delete_session(
+            app_name=test_app_name,
+            user_id=test_user_id,
+            session_id=test_session_id
+        )
 
 async def test_mcp_server_tools():
     """Test database MCP server tools."""
-    test_name = "Database MCP Server Tools"
-    print_test_header(test_name)
-    
     try:
-        # Test MCP server tool definitions
-        from database_mcp_server import server
+        # Test MCP server tool definitions. server.list_tools() is the
+        # decorator that registers the handler, so await the handler itself
+        from database_mcp_server import list_tools
         
         # Get available tools
-        tools_result = await server.list_tools()
+        tools_result = await list_tools()
         
         if not tools_result or not hasattr(tools_result, 'tools'):
-            print_test_result(test_name, False, "No tools returned from MCP server")
-            return False
+            return False, "No tools returned from MCP server"
         
         expected_tools = [
             "get_player_stats",
@@ -144,125 +147,99 @@ async def test_mcp_server_tools():
         missing_tools = [tool for tool in expected_tools if tool not in available_tools]
         
         if missing_tools:
-            print_test_result(test_name, False, f"Missing tools: {', '.join(missing_tools)}")
-            return False
+            return False, f"Missing tools: {', '.join(missing_tools)}"
         else:
-            print_test_result(test_name, True, f"All {len(expected_tools)} expected tools available")
-            return True
+            return True, f"All {len(expected_tools)} expected tools available"
             
     except Exception as e:
-        print_test_result(test_name, False, f"MCP server test failed: {e}")
-        return False
+        return False, f"MCP server test failed: {e}"
 
 async def test_enhanced_agent_creation():
     """Test enhanced agent creation with new tools."""
-    test_name = "Enhanced Agent Creation"
-    print_test_header(test_name)
-    
     try:
-        from agents import create_prediction_agent, create_analysis_agent, create_dispatcher_agent
+        from agents import ROOT_AGENT
         
-        # Create enhanced agents
-        prediction_agent = create_prediction_agent()
-        analysis_agent = create_analysis_agent()
-        dispatcher_agent = create_dispatcher_agent(prediction_agent, analysis_agent)
+        # The single tennis_agent should carry get_predictions, get_value_bets and analyze_matchup
+        if len(ROOT_AGENT.tools) < 3:
+            return False, f"tennis_agent has only {len(ROOT_AGENT.tools)} tools, expected at least 3"
         
-        # Check that agents have the expected number of tools
-        # Prediction agent should have 3 tools: get_predictions, get_value_bets, query_database
-        if len(prediction_agent.tools) < 3:
-            print_test_result(test_name, False, f"Prediction agent has only {len(prediction_agent.tools)} tools, expected at least 3")
-            return False
+        # No dispatcher hop: the root agent answers directly
+        if ROOT_AGENT.sub_agents:
+            return False, f"tennis_agent has {len(ROOT_AGENT.sub_agents)} sub-agents, expected 0"
         
-        # Analysis agent should have 1 tool: analyze_matchup
-        if len(analysis_agent.tools) != 1:
-            print_test_result(test_name, False, f"Analysis agent has {len(analysis_agent.tools)} tools, expected 1")
-            return False
-        
-        # Dispatcher agent should have 2 sub-agents
-        if len(dispatcher_agent.sub_agents) != 2:
-            print_test_result(test_name, False, f"Dispatcher agent has {len(dispatcher_agent.sub_agents)} sub-agents, expected 2")
-            return False
-        
-        print_test_result(test_name, True, f"Agent creation successful - Prediction: {len(prediction_agent.tools)} tools, Analysis: {len(analysis_agent.tools)} tool, Dispatcher: {len(dispatcher_agent.sub_agents)} sub-agents")
-        return True
+        return True, f"Agent creation successful - tennis_agent: {len(ROOT_AGENT.tools)} tools"
         
     except Exception as e:
-        print_test_result(test_name, False, f"Agent creation test failed: {e}")
-        return False
+        return False, f"Agent creation test failed: {e}"
 
 async def test_environment_variables():
     """Test required environment variables."""
-    test_name = "Environment Variables"
-    print_test_header(test_name)
-    
-    required_vars = [
-        "DATABASE_URL",
-        "GOOGLE_API_KEY", 
-        "TELEGRAM_BOT_TOKEN"
-    ]
-    
-    missing_vars = []
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
+    # Same view of the environment as the other tests, .env included
+    env = load_env()
+    missing_vars = sorted(var for var in REQUIRED_ENV_VARS if not env.get(var))
     
     if missing_vars:
-        print_test_result(test_name, False, f"Missing variables: {', '.join(missing_vars)}")
-        return False
+        return False, f"Missing variables: {', '.join(missing_vars)}"
     else:
-        print_test_result(test_name, True, "All required environment variables present")
-        return True
+        return True, "All required environment variables present"
 
 async def test_main_agent_imports():
     """Test that main agent can be imported with new dependencies."""
-    test_name = "Main Agent Imports"
-    print_test_header(test_name)
-    
     try:
         # Test imports
         from database_session_service import create_database_session_service
-        from agents import create_prediction_agent, create_analysis_agent, create_dispatcher_agent
+        from agents import ROOT_AGENT
         
         # Test creating session service
         session_service = create_database_session_service()
         if not session_service:
             raise Exception("Failed to create session service")
         
-        # Test creating agents
-        prediction_agent = create_prediction_agent()
-        analysis_agent = create_analysis_agent()
-        dispatcher_agent = create_dispatcher_agent(prediction_agent, analysis_agent)
-        
-        print_test_result(test_name, True, "All imports and object creation successful")
-        return True
+        return True, "All imports and object creation successful"
         
     except Exception as e:
-        print_test_result(test_name, False, f"Import test failed: {e}")
-        return False
+        return False, f"Import test failed: {e}"
 
 async def run_all_tests():
     """Run all tests."""
     print("🚀 Starting Enhanced Tennis Prediction Agent Tests")
     print(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    tests = [
+    # Checks that only read run concurrently, so the suite waits on the
+    # slowest round trip rather than their sum; the session test writes rows
+    # and runs on its own afterwards. Tests return (success, message) rather
+    # than printing, so each one's output is printed whole and in test order.
+    independent = [
         ("Environment Variables", test_environment_variables),
         ("Database Connection", test_database_connection),
-        ("Database Session Service", test_database_session_service),
         ("MCP Server Tools", test_mcp_server_tools),
         ("Main Agent Imports", test_main_agent_imports),
         ("Enhanced Agent Creation", test_enhanced_agent_creation),
     ]
+    ordered = [
+        ("Database Session Service", test_database_session_service),
+    ]
     
     results = []
     
-    for test_name, test_func in tests:
-        try:
-            result = await test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"\n❌ CRITICAL ERROR in {test_name}: {e}")
-            results.append((test_name, False))
+    try:
+        started = datetime.now()
+        outcomes = await asyncio.gather(
+            *(test_func() for _, test_func in independent),
+            return_exceptions=True,
+        )
+        for (test_name, _), outcome in zip(independent, outcomes):
+            results.append((test_name, report_test(test_name, started, outcome)))
+        
+        for test_name, test_func in ordered:
+            started = datetime.now()
+            try:
+                outcome = await test_func()
+            except Exception as e:
+                outcome = e
+            results.append((test_name, report_test(test_name, started, outcome)))
+    finally:
+        await close_shared_pool()
     
     # Print summary
     print("\n" + "="*60)
@@ -291,6 +268,8 @@ def main():
         # Change to script directory
         os.chdir(os.path.dirname(os.path.abspath(__file__)))
         
+        install_uvloop()
+        
         # Run tests
         success = asyncio.run(run_all_tests())
         
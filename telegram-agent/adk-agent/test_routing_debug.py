@@ -23,15 +23,14 @@ def test_tool_creation():
     print("-" * 40)
     
     try:
-        from tools import (
-            get_player_matchups, 
-            analyze_player_performance,
-            get_player_matchups_tool,
-            analyze_player_performance_tool
-        )
+        from tools import get_player_matchups, analyze_player_performance
+        from tools_registry import TOOLS
         
         print("✅ All player analysis functions imported successfully")
-        print("✅ All FunctionTool instances imported successfully")
+        
+        # FunctionTool instances live in the shared registry
+        assert 'get_player_matchups' in TOOLS and 'analyze_player_performance' in TOOLS
+        print("✅ All FunctionTool instances found in the registry")
         
         # Test that the functions exist and are callable
         assert callable(get_player_matchups), "get_player_matchups should be callable"
@@ -54,12 +53,7 @@ def test_agent_creation():
         sys.path.insert(0, os.path.dirname(__file__))
         
         # Import the function tools
-        from tools import (
-            get_player_matchups_tool,
-            analyze_player_performance_tool,
-            get_predictions_tool,
-            get_value_bets_tool
-        )
+        from tools_registry import TOOLS
         
         # Manually create the prediction agent to test tool assignment
         from google.adk.agents import LlmAgent
@@ -73,10 +67,10 @@ def test_agent_creation():
             instruction="Test agent for tool verification",
             model=GEMINI_MODEL,
             tools=[
-                get_predictions_tool,
-                get_value_bets_tool, 
-                get_player_matchups_tool,
-                analyze_player_performance_tool
+                TOOLS["get_predictions"],
+                TOOLS["get_value_bets"],
+                TOOLS["get_player_matchups"],
+                TOOLS["analyze_player_performance"],
             ],
         )
         
@@ -27,7 +27,8 @@ def test_tool_availability():
         print("✅ analyze_player_performance tool imported successfully")
         
         # Test that FunctionTool instances are created
-        from tools import get_player_matchups_tool, analyze_player_performance_tool
+        from tools_registry import TOOLS
+        assert 'get_player_matchups' in TOOLS and 'analyze_player_performance' in TOOLS
         print("✅ FunctionTool instances created successfully")
         
         return True
@@ -42,30 +43,19 @@ def test_agent_creation():
     print("-" * 40)
     
     try:
-        from agents import create_prediction_agent, create_analysis_agent, create_dispatcher_agent
+        from agents import ROOT_AGENT
         
-        prediction_agent = create_prediction_agent()
-        analysis_agent = create_analysis_agent()
-        dispatcher_agent = create_dispatcher_agent(prediction_agent, analysis_agent)
+        print("✅ Root agent created successfully")
         
-        print("✅ All agents created successfully")
-        
-        # Check prediction agent has the right tools
-        tool_names = [tool.name for tool in prediction_agent.tools]
-        expected_tools = ['get_predictions', 'get_value_bets', 'get_player_matchups', 'analyze_player_performance']
+        # The single tennis_agent owns every tool, including analyze_matchup
+        tool_names = [tool.name for tool in ROOT_AGENT.tools]
+        expected_tools = ['get_predictions', 'get_value_bets', 'analyze_matchup']
         
         missing_tools = [tool for tool in expected_tools if tool not in tool_names]
         if missing_tools:
-            print(f"⚠️  Missing tools in prediction_agent: {missing_tools}")
-        else:
-            print("✅ Prediction agent has all expected tools")
-        
-        # Check analysis agent has analyze_matchup tool
-        analysis_tool_names = [tool.name for tool in analysis_agent.tools]
-        if 'analyze_matchup' in analysis_tool_names:
-            print("✅ Analysis agent has analyze_matchup tool")
+            print(f"⚠️  Missing tools in tennis_agent: {missing_tools}")
         else:
-            print("❌ Analysis agent missing analyze_matchup tool")
+            print("✅ tennis_agent has all expected tools")
         
         return True
         
@@ -140,9 +130,9 @@ def main():
     if passed == total:
         print("\n🎉 Routing fix working!")
         print("\n💡 Expected behavior for 'Cirpanli analysis':")
-        print("   1. Dispatcher routes to prediction_agent")
-        print("   2. Prediction_agent uses get_player_matchups or analyze_player_performance")
-        print("   3. Shows Cirpanli's matchups/performance (or graceful fallback)")
+        print("   1. tennis_agent handles the query directly")
+        print("   2. tennis_agent uses get_predictions, get_value_bets or analyze_matchup")
+        print("   3. Shows Cirpanli's predictions/matchups (or graceful fallback)")
         print("   4. No more 'need opponent' messages!")
     else:
         print("\n⚠️  Some routing issues detected.")
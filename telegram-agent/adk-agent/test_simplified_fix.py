@@ -6,6 +6,8 @@ Test the simplified fix - This should work now!
 import os
 import sys
 
+from check_bot_version import read_agent_sources
+
 def test_simplified_fix():
     """Test that the simplified fix will work."""
     print("🧪 Testing Simplified Fix")
@@ -15,8 +17,7 @@ def test_simplified_fix():
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
     
     # Check the current agents.py content
-    with open('agents.py', 'r') as f:
-        content = f.read()
+    content = read_agent_sources()
     
     print("🔍 Checking Fix Components:")
     
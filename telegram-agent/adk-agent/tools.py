@@ -1,25 +1,97 @@
 import os
+import asyncio
+import functools
 import requests
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from google.adk.tools import FunctionTool
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+
+from caching import ttl_cache
 
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+TOOL_CONCURRENCY_LIMIT = int(os.getenv("TOOL_CONCURRENCY_LIMIT", "4"))
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+
+# Response cache TTLs (seconds). Predictions carry live match status so they
+# expire quickly; the value-bet list only changes when the daily run lands.
+PREDICTIONS_CACHE_TTL = int(os.getenv("PREDICTIONS_CACHE_TTL", "300"))
+VALUE_BETS_CACHE_TTL = int(os.getenv("VALUE_BETS_CACHE_TTL", "1800"))
 
 # Import psycopg2 with fallback
 try:
     import psycopg2
+    from psycopg2.pool import ThreadedConnectionPool
     DATABASE_AVAILABLE = True
 except ImportError:
     psycopg2 = None
     DATABASE_AVAILABLE = False
     print("Warning: psycopg2 not available. Database functions will use fallback responses.")
 
+# Bounded pool for the blocking tool bodies (psycopg2, requests). When the model
+# emits several function calls in one turn ADK awaits them together, so async
+# wrappers that hop onto this pool let independent tools run concurrently
+# instead of blocking the event loop one after another.
+_tool_executor = ThreadPoolExecutor(
+    max_workers=TOOL_CONCURRENCY_LIMIT,
+    thread_name_prefix="tennis-tool",
+)
+
+# Player-name lookups fanned out from inside a tool. Kept separate from
+# _tool_executor because the tool itself already occupies a worker there, and
+# waiting on the same saturated pool could deadlock.
+_lookup_executor = ThreadPoolExecutor(
+    max_workers=TOOL_CONCURRENCY_LIMIT,
+    thread_name_prefix="tennis-lookup",
+)
+
+# Shared psycopg2 pool so tool calls reuse connections instead of paying the
+# TCP/TLS/auth handshake on every call. Created on first use so importing this
+# module never needs a reachable database.
+_db_pool: Optional["ThreadedConnectionPool"] = None
+_db_pool_lock = threading.Lock()
+
+def get_connection():
+    """Check a connection out of the shared pool, creating the pool on first use."""
+    global _db_pool
+    if _db_pool is None:
+        with _db_pool_lock:
+            if _db_pool is None:
+                _db_pool = ThreadedConnectionPool(
+                    minconn=DB_POOL_MIN_SIZE,
+                    maxconn=DB_POOL_MAX_SIZE,
+                    dsn=DATABASE_URL,
+                )
+    return _db_pool.getconn()
+
+def release_connection(conn) -> None:
+    """Return a connection to the pool; an open transaction is rolled back."""
+    _db_pool.putconn(conn)
+
+def run_in_executor(func: Callable[..., str]) -> Callable[..., Awaitable[str]]:
+    """
+    Wrap a blocking tool as a coroutine that runs on the shared tool pool.
+    functools.wraps keeps the name, signature and docstring ADK uses to build
+    the function declaration.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _tool_executor, functools.partial(func, *args, **kwargs)
+        )
+    return wrapper
+
+def _is_cacheable(result: str) -> bool:
+    """Only cache real answers, never error messages."""
+    return not result.startswith("Error")
+
 def find_players_by_name(search_name: str, max_results: int = 5) -> List[Dict[str, str]]:
     """
     Find players in the database that match the given name.
@@ -32,8 +104,9 @@ def find_players_by_name(search_name: str, max_results: int = 5) -> List[Dict[st
     Returns:
         List of player dictionaries with 'full_name' and 'match_type'
     """
+    conn = None
     try:
-        conn = psycopg2.connect(DATABASE_URL)
+        conn = get_connection()
         cur = conn.cursor()
         
         # Clean the search name
@@ -98,7 +171,7 @@ def find_players_by_name(search_name: str, max_results: int = 5) -> List[Dict[st
     finally:
         if conn:
             cur.close()
-            conn.close()
+            release_connection(conn)
 
 def expand_player_name(player_input: str) -> List[str]:
     """
@@ -164,7 +237,7 @@ def get_player_matchups(player_name: str, limit: int = 20) -> str:
         # Single player found - proceed with query
         player_name = full_player_names[0]
         
-        conn = psycopg2.connect(DATABASE_URL)
+        conn = get_connection()
         cur = conn.cursor()
         
         query = """
@@ -214,7 +287,7 @@ def get_player_matchups(player_name: str, limit: int = 20) -> str:
     finally:
         if conn:
             cur.close()
-            conn.close()
+            release_connection(conn)
 
 def analyze_player_performance(player_name: str, matches_back: int = 20) -> str:
     """
@@ -238,7 +311,7 @@ def analyze_player_performance(player_name: str, matches_back: int = 20) -> str:
         
         player_name = full_player_names[0]
         
-        conn = psycopg2.connect(DATABASE_URL)
+        conn = get_connection()
         cur = conn.cursor()
         
         query = """
@@ -292,8 +365,9 @@ def analyze_player_performance(player_name: str, matches_back: int = 20) -> str:
     finally:
         if conn:
             cur.close()
-            conn.close()
+            release_connection(conn)
 
+@ttl_cache(ttl=PREDICTIONS_CACHE_TTL, cache_if=_is_cacheable)
 def get_predictions(
     action: Optional[str] = None,
     min_odds: Optional[float] = None,
@@ -318,7 +392,7 @@ def get_predictions(
     """
     conn = None
     try:
-        conn = psycopg2.connect(DATABASE_URL)
+        conn = get_connection()
         cur = conn.cursor()
 
         query = """
@@ -397,7 +471,8 @@ def get_predictions(
             output += f"{idx + 1}. *{p['matchup']}*\n"
             output += f"   {p['tournament']} • {p['surface']}\n"
             output += f"   {p['prediction']} ({p['confidence']})\n"
-            output += f"   Action: {p['action']}{f' • {p['value_bet']}' if p['value_bet'] else ''}\n\n"
+            value_bet_suffix = f" • {p['value_bet']}" if p['value_bet'] else ""
+            output += f"   Action: {p['action']}{value_bet_suffix}\n\n"
 
         if len(formatted_predictions) > 10:
             output += f"\n...and {len(formatted_predictions) - 10} more"
@@ -410,7 +485,7 @@ def get_predictions(
     finally:
         if conn:
             cur.close()
-            conn.close()
+            release_connection(conn)
 
 def analyze_matchup(
     player1: str,
@@ -430,9 +505,12 @@ def analyze_matchup(
         llm: Which LLM to use for analysis (default: "perplexity", options: "perplexity", "gemini").
         focus: Specific aspect to analyze (e.g., 'head-to-head', 'recent-form', 'surface-preference').
     """
-    # First, try to resolve partial player names to full names
-    full_player1_names = expand_player_name(player1)
+    # First, try to resolve partial player names to full names. The two lookups
+    # are independent DB round trips, so player1 resolves on the lookup pool
+    # while player2 resolves here.
+    player1_lookup = _lookup_executor.submit(expand_player_name, player1)
     full_player2_names = expand_player_name(player2)
+    full_player1_names = player1_lookup.result()
     
     if not full_player1_names:
         return f"I couldn't find any players matching '{player1}'. Please try a different name or check the spelling."
@@ -489,6 +567,7 @@ def analyze_matchup(
         print(f"Error in analyze_matchup: {e}")
         return f"Error analyzing matchup: {e}"
 
+@ttl_cache(ttl=VALUE_BETS_CACHE_TTL, cache_if=_is_cacheable)
 def get_value_bets(
     limit: int = 10,
     date: Optional[str] = None,
@@ -502,7 +581,7 @@ def get_value_bets(
     """
     conn = None
     try:
-        conn = psycopg2.connect(DATABASE_URL)
+        conn = get_connection()
         cur = conn.cursor()
 
         query = """
@@ -539,13 +618,4 @@ def get_value_bets(
     finally:
         if conn:
             cur.close()
-            conn.close()
-
-# Create FunctionTool instances - the ADK automatically extracts name and docstring from the function
-get_predictions_tool = FunctionTool(get_predictions)
-analyze_matchup_tool = FunctionTool(analyze_matchup)
-get_value_bets_tool = FunctionTool(get_value_bets)
-
-# Enhanced player matching tools
-get_player_matchups_tool = FunctionTool(get_player_matchups)
-analyze_player_performance_tool = FunctionTool(analyze_player_performance)
+            release_connection(conn)
@@ -0,0 +1,33 @@
+"""
+Single registry of the FunctionTools exposed to agents.
+
+Every agent factory picks its tools from TOOLS by name, so the process holds
+one FunctionTool (and one async executor wrapper) per tool no matter how many
+agents or modules use it.
+"""
+
+from types import MappingProxyType
+
+from google.adk.tools import FunctionTool
+
+from tools import (
+    get_predictions,
+    analyze_matchup,
+    get_value_bets,
+    get_player_matchups,
+    analyze_player_performance,
+    run_in_executor,
+)
+
+# The ADK extracts each tool's name and docstring from the function; the async
+# wrappers keep blocking DB/HTTP work off the event loop.
+TOOLS = MappingProxyType({
+    func.__name__: FunctionTool(run_in_executor(func))
+    for func in (
+        get_predictions,
+        analyze_matchup,
+        get_value_bets,
+        get_player_matchups,
+        analyze_player_performance,
+    )
+})
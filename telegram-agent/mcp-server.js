@@ -431,7 +431,7 @@ async function handleGetTournamentStats(args) {
             NULLIF(COUNT(CASE WHEN p.prediction_correct IS NOT NULL THEN 1 END), 0) * 100, 2) as accuracy
     FROM predictions p
     WHERE p.tournament ILIKE $1
-      AND p.prediction_day >= CURRENT_DATE - ($2 || ' days')::interval
+      AND p.prediction_day >= CURRENT_DATE - make_interval(days => $2::int)
   `,
     [args.tournament, daysBack]
   );
@@ -88,7 +88,7 @@ def print_architecture():
 ║  │  │ agent_sessions  │  │ session_events  │  │ user_context               │  │  ║
 ║  │  │                 │  │                 │  │                            │  │  ║
 ║  │  │ • session_id    │  │ • event_id      │  │ • user_id                  │  │  ║
-║  │  │ • events[]      │  │ • event_type    │  │ • preferences              │  │  ║
+║  │  │ • counters      │  │ • event_type    │  │ • preferences              │  │  ║
 ║  │  │ • state{}       │  │ • event_data    │  │ • interaction_stats        │  │  ║
 ║  │  │ • metadata{}    │  │ • timestamp     │  │                            │  │  ║
 ║  │  └─────────────────┘  └─────────────────┘  └─────────────────────────────┘  │  ║